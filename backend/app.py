@@ -1,7 +1,9 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from backend.config import get_settings
-from backend.routes import health, properties, saved, nlp, compare
+from backend.middleware import MetricsMiddleware, ProfilingMiddleware
+from backend.routes import admin, health, properties, saved, nlp, compare, metrics
+from backend.services.profiler import RequestProfiler
 
 
 def create_app() -> FastAPI:
@@ -15,12 +17,25 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.state.profiler = RequestProfiler.from_settings(settings)
+    if app.state.profiler.enabled:
+        app.add_middleware(ProfilingMiddleware, profiler=app.state.profiler)
+    app.add_middleware(MetricsMiddleware)
     app.include_router(health.router)
+    app.include_router(metrics.router)
     app.include_router(properties.router)
     app.include_router(saved.router)
     app.include_router(nlp.router)
     app.include_router(compare.router)
+    app.include_router(admin.router)
     return app
 
 
-app = create_app()
+def __getattr__(name: str):
+    # `app` is built on first access (e.g. `from backend.app import app` in
+    # main.py) so importing this module for create_app() stays cheap.
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1 @@
+"""Performance benchmarks for the search, compare and NLP hot paths."""
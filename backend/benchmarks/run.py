@@ -0,0 +1,280 @@
+"""Benchmark harness for the search, compare and NLP hot paths.
+
+Generates synthetic catalogs, times the core functions and the HTTP endpoints
+(through TestClient) and writes machine-readable JSON. Medians are checked
+against `thresholds.json` and, optionally, a previous results file.
+
+    python -m backend.benchmarks.run --sizes 10000 100000 --output bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from backend.benchmarks.synthetic import generate_catalog
+
+DEFAULT_THRESHOLDS = Path(__file__).with_name("thresholds.json")
+
+# Timings that depend on whether the pickled price model loaded. Without it,
+# predictions fall back to the listed price and these only time the fallback,
+# so their limits live under thresholds["by_model_state"]["missing"|"loaded"].
+MODEL_BENCHMARKS = {"predict_price.x1000", "predict_prices.batch1000", "POST /compare/predict"}
+
+NLP_QUERIES = [
+    "3 bedroom house in Austin under 500000",
+    "condo near downtown Miami with pool and gym",
+    "show me something in san francisco over 900000",
+    "hello, what can you do?",
+]
+
+
+def measure(fn: Callable[[], Any], repeat: int = 5, warmup: int = 1) -> Dict[str, float]:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "runs": repeat,
+        "min_ms": round(samples[0], 4),
+        "median_ms": round(statistics.median(samples), 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "max_ms": round(samples[-1], 4),
+    }
+
+
+@contextmanager
+def _loaders_pointed_at(data_dir: Path) -> Iterator[None]:
+    """Temporarily repoint every route module's PropertyDataLoader at a synthetic catalog."""
+    from backend.routes import compare, properties, saved
+
+    loaders = [module.data_loader for module in (compare, properties, saved)]
+    original_dirs = [loader.data_dir for loader in loaders]
+    try:
+        for loader in loaders:
+            loader.data_dir = data_dir
+            loader.load(force_reload=True)
+        yield
+    finally:
+        for loader, original in zip(loaders, original_dirs):
+            loader.data_dir = original
+            loader.load(force_reload=True)
+
+
+def bench_catalog(data_dir: Path, size: int, repeat: int) -> List[Dict[str, Any]]:
+    from fastapi.testclient import TestClient
+
+    from backend.app import create_app
+    from backend.services.data_loader import PropertyDataLoader
+    from backend.services.features import map_features
+    from backend.services.filter import apply_filters, paginate
+    from backend.services.model import PriceModel
+
+    results: List[Dict[str, Any]] = []
+
+    def record(name: str, fn: Callable[[], Any], runs: int = repeat) -> None:
+        results.append({"name": name, "size": size, **measure(fn, repeat=runs)})
+
+    # Loading is the slowest step at large sizes; cap its repeats
+    record("loader.load", lambda: PropertyDataLoader(str(data_dir)).load(), runs=min(repeat, 3))
+
+    catalog = PropertyDataLoader(str(data_dir)).load()
+    record("apply_filters.location", lambda: apply_filters(catalog, location="Austin"))
+    record(
+        "apply_filters.combined",
+        lambda: paginate(
+            apply_filters(
+                catalog,
+                location=["Austin", "Dallas"],
+                min_price=300_000,
+                max_price=1_500_000,
+                min_bedrooms=2,
+                amenities=["gym"],
+                sort_by="price",
+                sort_order="desc",
+            ),
+            1,
+            10,
+        ),
+    )
+
+    model = PriceModel()
+    sample = catalog[:1000]
+    features = [map_features(prop) for prop in sample]
+    fallbacks = [prop.get("price") for prop in sample]
+    record(
+        "predict_price.x1000",
+        lambda: [model.predict_price(f, fallback_price=fb) for f, fb in zip(features, fallbacks)],
+    )
+    record("predict_prices.batch1000", lambda: model.predict_prices(features, fallbacks))
+
+    ids = [prop["id"] for prop in catalog[:50]]
+    with _loaders_pointed_at(data_dir), TestClient(create_app()) as client:
+        endpoints = {
+            "GET /properties/search": lambda: client.get(
+                "/properties/search", params={"location": "Austin", "min_bedrooms": 2}
+            ),
+            "GET /properties/search?near": lambda: client.get(
+                "/properties/search",
+                params={"near": "downtown Austin", "radius_km": 10, "sort_by": "distance"},
+            ),
+            "POST /compare/predict": lambda: client.post(
+                "/compare/predict", json={"address_a": "Austin, TX", "address_b": "Miami, FL"}
+            ),
+            "POST /compare/batch": lambda: client.post("/compare/batch", json={"property_ids": ids}),
+            "POST /nlp/parse": lambda: client.post("/nlp/parse", json={"text": NLP_QUERIES[0]}),
+        }
+        for name, call in endpoints.items():
+            response = call()
+            if response.status_code != 200:
+                raise RuntimeError(f"{name} returned {response.status_code}: {response.text[:200]}")
+            record(name, call)
+    return results
+
+
+def bench_nlp(repeat: int) -> List[Dict[str, Any]]:
+    from backend.routes.nlp import _heuristic_fallback
+
+    return [
+        {
+            "name": "_heuristic_fallback",
+            "size": 0,
+            **measure(lambda: [_heuristic_fallback(q) for q in NLP_QUERIES], repeat=repeat),
+        }
+    ]
+
+
+def check_regressions(
+    results: List[Dict[str, Any]],
+    thresholds: Dict[str, Any],
+    baseline: Optional[List[Dict[str, Any]]] = None,
+    tolerance: float = 0.25,
+    model_loaded: bool = False,
+    baseline_model_loaded: Optional[bool] = None,
+) -> List[Dict[str, Any]]:
+    """Return every result whose median exceeds its threshold or regressed vs baseline.
+
+    Model benchmarks are checked against the limits for the current model
+    state, and never against a baseline recorded with the other state.
+    """
+    by_state = thresholds.get("by_model_state", {}).get("loaded" if model_loaded else "missing", {})
+    previous = {(r["name"], r["size"]): r["median_ms"] for r in baseline or []}
+    regressions = []
+    for result in results:
+        key = (result["name"], result["size"])
+        model_dependent = result["name"] in MODEL_BENCHMARKS
+        source = by_state if model_dependent else thresholds
+        limit = source.get(result["name"], {}).get(str(result["size"]))
+        comparable = not model_dependent or baseline_model_loaded in (None, model_loaded)
+        if limit is not None and result["median_ms"] > limit:
+            regressions.append({**result, "reason": "threshold", "limit_ms": limit})
+        elif comparable and key in previous and result["median_ms"] > previous[key] * (1 + tolerance):
+            regressions.append({**result, "reason": "baseline", "baseline_ms": previous[key]})
+    return regressions
+
+
+def model_state_warnings(thresholds: Dict[str, Any], model_loaded: bool) -> List[str]:
+    if not model_loaded:
+        return [
+            "price model not loaded: model benchmarks time the listed-price fallback "
+            "and are checked against by_model_state.missing"
+        ]
+    if not thresholds.get("by_model_state", {}).get("loaded"):
+        return [
+            "price model loaded but by_model_state.loaded has no limits: "
+            "model benchmarks are not threshold-checked"
+        ]
+    return []
+
+
+def run_suite(
+    sizes: List[int],
+    repeat: int = 5,
+    workdir: Optional[Path] = None,
+    seed: int = 42,
+) -> Dict[str, Any]:
+    # Never let the NLP benchmark hit the real OpenAI API
+    saved_key = os.environ.pop("OPENAI_API_KEY", None)
+    try:
+        with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+            results = bench_nlp(repeat)
+            for size in sizes:
+                data_dir = generate_catalog(Path(tmp) / f"catalog_{size}", size, seed=seed)
+                results.extend(bench_catalog(data_dir, size, repeat))
+    finally:
+        if saved_key is not None:
+            os.environ["OPENAI_API_KEY"] = saved_key
+
+    from backend.services.model import PriceModel
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "sizes": sizes,
+            "repeat": repeat,
+            "seed": seed,
+            "model_loaded": PriceModel().model is not None,
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run backend performance benchmarks.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="Write results JSON here (default: stdout)")
+    parser.add_argument("--thresholds", type=Path, default=DEFAULT_THRESHOLDS)
+    parser.add_argument("--baseline", type=Path, help="Previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown vs baseline")
+    parser.add_argument("--workdir", type=Path, help="Where synthetic catalogs are generated")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.sizes, repeat=args.repeat, workdir=args.workdir, seed=args.seed)
+    thresholds = json.loads(args.thresholds.read_text()) if args.thresholds.exists() else {}
+    previous = json.loads(args.baseline.read_text()) if args.baseline else None
+    model_loaded = report["meta"]["model_loaded"]
+    report["regressions"] = check_regressions(
+        report["results"],
+        thresholds,
+        previous["results"] if previous else None,
+        args.tolerance,
+        model_loaded=model_loaded,
+        baseline_model_loaded=previous.get("meta", {}).get("model_loaded") if previous else None,
+    )
+    report["warnings"] = model_state_warnings(thresholds, model_loaded)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(payload)
+    else:
+        print(payload)
+    for warning in report["warnings"]:
+        print(f"WARNING {warning}", file=sys.stderr)
+    for regression in report["regressions"]:
+        print(
+            f"REGRESSION {regression['name']} @ {regression['size']}: "
+            f"{regression['median_ms']:.2f} ms ({regression['reason']})",
+            file=sys.stderr,
+        )
+    return 1 if report["regressions"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Import-time and startup-time budget check for API workers.
+
+Measures, in fresh interpreters, how long `import backend.app`, `create_app()`
+and the first request take, breaks import time down by top-level package
+(via `python -X importtime`) and verifies that optional heavy dependencies
+are not loaded at startup.
+
+    python -m backend.benchmarks.startup --import-budget-ms 1000 --startup-budget-ms 1500
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Must stay out of sys.modules until the feature that needs them is used
+HEAVY_MODULES = ["openai", "motor", "pymongo", "sklearn", "numpy", "scipy"]
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+_PROBE = r"""
+import asyncio, json, sys, time
+
+t0 = time.perf_counter()
+import backend.app
+t1 = time.perf_counter()
+app = backend.app.create_app()
+t2 = time.perf_counter()
+
+async def first_request():
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/health", "raw_path": b"/health", "root_path": "",
+        "query_string": b"", "headers": [], "client": ("probe", 1), "server": ("probe", 80),
+    }
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return sent[0]["status"]
+
+status = asyncio.run(first_request())
+t3 = time.perf_counter()
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "create_app_ms": (t2 - t1) * 1000,
+    "first_request_ms": (t3 - t2) * 1000,
+    "first_request_status": status,
+    "heavy_modules_loaded": [m for m in HEAVY_MODULES if m in sys.modules],
+}))
+"""
+
+
+def _run_python(args: List[str]) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONWARNINGS": "ignore"}
+    env.pop("OPENAI_API_KEY", None)
+    return subprocess.run(
+        [sys.executable, *args], cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def parse_importtime(output: str) -> Dict[str, float]:
+    """Sum `-X importtime` self-times (ms) per top-level package."""
+    totals: Dict[str, float] = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, _cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+            package = name.split(".")[0]
+            totals[package] = totals.get(package, 0.0) + int(self_us) / 1000
+        except ValueError:
+            continue
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def measure_startup(runs: int = 3, top: int = 15) -> Dict[str, Any]:
+    probe = f"HEAVY_MODULES = {HEAVY_MODULES!r}\n{_PROBE}"
+    samples = [json.loads(_run_python(["-c", probe]).stdout.strip().splitlines()[-1]) for _ in range(runs)]
+    best = min(samples, key=lambda s: s["import_ms"] + s["create_app_ms"] + s["first_request_ms"])
+
+    importtime = _run_python(["-X", "importtime", "-c", "import backend.app"]).stderr
+    breakdown = parse_importtime(importtime)
+    return {
+        "import_ms": round(best["import_ms"], 2),
+        "create_app_ms": round(best["create_app_ms"], 2),
+        "first_request_ms": round(best["first_request_ms"], 2),
+        "startup_ms": round(best["import_ms"] + best["create_app_ms"] + best["first_request_ms"], 2),
+        "first_request_status": best["first_request_status"],
+        "heavy_modules_loaded": best["heavy_modules_loaded"],
+        "import_breakdown_ms": {name: round(ms, 2) for name, ms in list(breakdown.items())[:top]},
+        "runs": runs,
+    }
+
+
+def check_budget(report: Dict[str, Any], import_budget_ms: float, startup_budget_ms: float) -> List[str]:
+    failures = []
+    if report["import_ms"] > import_budget_ms:
+        failures.append(f"import took {report['import_ms']:.0f} ms (budget {import_budget_ms:.0f} ms)")
+    if report["startup_ms"] > startup_budget_ms:
+        failures.append(f"startup took {report['startup_ms']:.0f} ms (budget {startup_budget_ms:.0f} ms)")
+    if report["heavy_modules_loaded"]:
+        failures.append(f"heavy modules loaded at startup: {', '.join(report['heavy_modules_loaded'])}")
+    if report["first_request_status"] != 200:
+        failures.append(f"first request returned {report['first_request_status']}")
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check API worker import/startup time against a budget.")
+    parser.add_argument("--import-budget-ms", type=float, default=1000)
+    parser.add_argument("--startup-budget-ms", type=float, default=1500)
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to sample; best run is kept")
+    parser.add_argument("--top", type=int, default=15, help="Packages to show in the import breakdown")
+    args = parser.parse_args(argv)
+
+    report = measure_startup(runs=args.runs, top=args.top)
+    report["failures"] = check_budget(report, args.import_budget_ms, args.startup_budget_ms)
+    print(json.dumps(report, indent=2))
+    for failure in report["failures"]:
+        print(f"BUDGET EXCEEDED: {failure}", file=sys.stderr)
+    return 1 if report["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+import json
+import random
+from pathlib import Path
+from typing import TextIO
+
+CITIES = [
+    ("New York", "NY", 40.7128, -74.0060),
+    ("Miami", "FL", 25.7617, -80.1918),
+    ("Los Angeles", "CA", 34.0522, -118.2437),
+    ("Austin", "TX", 30.2672, -97.7431),
+    ("San Francisco", "CA", 37.7749, -122.4194),
+    ("Chicago", "IL", 41.8781, -87.6298),
+    ("Dallas", "TX", 32.7767, -96.7970),
+    ("Seattle", "WA", 47.6062, -122.3321),
+    ("Boston", "MA", 42.3601, -71.0589),
+]
+TITLES = [
+    "{beds} BHK Apartment in Downtown",
+    "{beds} BHK Condo with City View",
+    "Family House with {beds} Bedrooms",
+    "Modern Townhouse with Backyard",
+    "Luxury Villa with Private Garden",
+    "Cozy Studio near the Park",
+]
+AMENITIES = [
+    "Gym", "Swimming Pool", "Parking", "Garage", "Balcony", "Security",
+    "Laundry", "Smart Home", "Private Garden", "Rooftop Terrace", "Beach Access",
+]
+
+
+class _ArrayWriter:
+    """Writes a JSON array one element at a time so huge catalogs never sit in memory."""
+
+    def __init__(self, f: TextIO) -> None:
+        self._f = f
+        self._first = True
+        f.write("[\n")
+
+    def write(self, item: dict) -> None:
+        if not self._first:
+            self._f.write(",\n")
+        self._first = False
+        self._f.write(json.dumps(item))
+
+    def close(self) -> None:
+        self._f.write("\n]\n")
+
+
+def generate_catalog(directory: Path, size: int, seed: int = 42, with_coordinates: bool = True) -> Path:
+    """Write `size` listings to `directory` in the three-file property_*.json format."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+
+    with (directory / "property_basics.json").open("w", encoding="utf-8") as basics_f, (
+        directory / "property_characteristics.json"
+    ).open("w", encoding="utf-8") as chars_f, (directory / "property_images.json").open(
+        "w", encoding="utf-8"
+    ) as images_f:
+        basics, chars, images = _ArrayWriter(basics_f), _ArrayWriter(chars_f), _ArrayWriter(images_f)
+        for pid in range(1, size + 1):
+            city, state, lat, lon = rng.choice(CITIES)
+            beds = rng.randint(1, 6)
+            size_sqft = rng.randint(400, 5000)
+            basic = {
+                "id": pid,
+                "title": rng.choice(TITLES).format(beds=beds),
+                "price": rng.randrange(150_000, 3_000_000, 1_000),
+                "location": f"{city}, {state}",
+            }
+            if with_coordinates:
+                # Scatter listings across roughly a 30 km box around the city centre
+                basic["lat"] = round(lat + rng.uniform(-0.15, 0.15), 5)
+                basic["lon"] = round(lon + rng.uniform(-0.15, 0.15), 5)
+            basics.write(basic)
+            chars.write(
+                {
+                    "id": pid,
+                    "bedrooms": beds,
+                    "bathrooms": rng.randint(1, max(1, beds)),
+                    "size_sqft": size_sqft,
+                    "amenities": rng.sample(AMENITIES, rng.randint(0, 4)),
+                }
+            )
+            images.write({"id": pid, "image_url": f"https://example.com/images/{pid}.jpg"})
+        for writer in (basics, chars, images):
+            writer.close()
+    return directory
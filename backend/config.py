@@ -19,6 +19,24 @@ class Settings(BaseSettings):
     data_dir: str = "backend/data"
     model_path: str = "complex_price_model_v2.pkl"
 
+    # "local": each process loads the data files itself. "shared": workers map
+    # the snapshot published in catalog_snapshot_dir (see serve.py).
+    catalog_mode: str = "local"
+    catalog_snapshot_dir: str = ".catalog_snapshots"
+
+    # Opt-in slow-request profiling. Sampled requests to the profiled paths that
+    # exceed the threshold are kept in memory and served under /admin/profiles.
+    profiling_enabled: bool = False
+    profiling_mode: str = "cprofile"  # "cprofile" or "stack"
+    profiling_sample_rate: float = 0.1
+    profiling_threshold_ms: float = 500.0
+    profiling_max_profiles: int = 20
+    # Comma-separated list of request paths to profile (PROFILING_PATHS)
+    profiling_paths_raw: Optional[str] = None
+
+    # /admin routes require a matching X-Admin-Token header; unset disables them (503)
+    admin_token: Optional[str] = None
+
     class Config:
         env_file = ".env"
 
@@ -64,6 +82,12 @@ class Settings(BaseSettings):
         # Fallback: treat as comma-separated list
         return [item.strip() for item in raw.split(",") if item.strip()]
 
+    @property
+    def profiling_paths(self) -> List[str]:
+        if not self.profiling_paths_raw:
+            return ["/properties/search", "/nlp/parse"]
+        return [item.strip() for item in self.profiling_paths_raw.split(",") if item.strip()]
+
 
 @lru_cache
 def get_settings() -> Settings:
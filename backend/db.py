@@ -1,12 +1,19 @@
+from __future__ import annotations
+
 from functools import lru_cache
 import os
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
+from typing import TYPE_CHECKING
 
 from backend.config import get_settings
 
+if TYPE_CHECKING:  # motor is imported lazily on first use to keep worker startup light
+    from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
+
 
 @lru_cache
 def get_client() -> AsyncIOMotorClient:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
     settings = get_settings()
     return AsyncIOMotorClient(settings.mongo_uri)
 
@@ -18,4 +25,3 @@ def get_database() -> AsyncIOMotorDatabase:
 
 def get_saved_collection() -> AsyncIOMotorCollection:
     return get_database()["saved_properties"]
-
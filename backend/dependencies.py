@@ -0,0 +1,15 @@
+import secrets
+
+from fastapi import Header, HTTPException
+
+from backend.config import get_settings
+
+
+def require_admin(x_admin_token: str | None = Header(None)) -> None:
+    """Guard for privileged routes (admin, catalog ingestion)."""
+    token = get_settings().admin_token
+    # Fail closed: without a configured token these routes are unusable
+    if not token:
+        raise HTTPException(status_code=503, detail="Admin token not configured")
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
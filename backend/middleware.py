@@ -0,0 +1,62 @@
+import time
+
+from backend.services.metrics import metrics
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware timing each HTTP request by its route template.
+
+    Labelling by template (``/properties/{property_id}``) rather than raw path
+    keeps the number of series bounded.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            metrics.observe(
+                "http_request_duration_ms",
+                (time.perf_counter() - start) * 1000,
+                method=scope["method"],
+                route=getattr(route, "path", "<unmatched>"),
+                status=f"{status_code // 100}xx",
+            )
+
+
+class ProfilingMiddleware:
+    """Profiles sampled requests via a `RequestProfiler`; only installed when profiling is enabled."""
+
+    def __init__(self, app, profiler) -> None:
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        capture = self.profiler.start(scope["path"])
+        if capture is None:
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.profiler.finish(capture, scope["method"], scope["path"])
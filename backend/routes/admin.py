@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import PlainTextResponse, Response
+
+from backend.dependencies import require_admin
+from backend.services.profiler import RequestProfiler
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+def _profiler(request: Request) -> RequestProfiler:
+    return request.app.state.profiler
+
+
+@router.get("/profiles")
+async def list_profiles(request: Request) -> dict:
+    profiler = _profiler(request)
+    return {
+        "enabled": profiler.enabled,
+        "mode": profiler.mode,
+        "threshold_ms": profiler.threshold_ms,
+        "sample_rate": profiler.sample_rate,
+        "profiles": [p.summary() for p in reversed(profiler.profiles())],
+    }
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: int, request: Request, format: str = "text") -> Response:
+    profile = _profiler(request).get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    try:
+        if format == "pstats":
+            return Response(
+                profile.to_pstats_bytes(),
+                media_type="application/octet-stream",
+                headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.pstats"'},
+            )
+        if format == "collapsed":
+            return PlainTextResponse(profile.to_collapsed())
+        if format == "text":
+            return PlainTextResponse(profile.to_text())
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    raise HTTPException(status_code=400, detail="format must be one of: text, pstats, collapsed")
+
+
+@router.delete("/profiles", status_code=204)
+async def clear_profiles(request: Request) -> None:
+    _profiler(request).clear()
@@ -1,16 +1,30 @@
+from typing import Iterable, Sequence
+
 from fastapi import APIRouter
 
 from backend.schemas import (
+    BatchPredictedProperty,
     CompareAddressesRequest,
+    CompareBatchRequest,
+    CompareBatchResponse,
     ComparePredictionResponse,
     PredictedProperty,
 )
-from backend.services.data_loader import PropertyDataLoader
+from backend.services.comparison import compare_shortlist
+from backend.services.data_loader import AddressIndex, PropertyDataLoader
+from backend.services.features import map_features
+from backend.services.metrics import record_cache
 from backend.services.model import price_model
 
 router = APIRouter(prefix="/compare", tags=["compare"])
 data_loader = PropertyDataLoader()
 
+# property id -> (features, predicted price), valid for one catalog version;
+# entries for listings changed through the change log are dropped one by one
+_prediction_cache: dict[str, tuple[dict, float]] = {}
+_prediction_cache_version = -1
+_prediction_cache_revision = -1
+
 
 def pick_property(address: str, properties: list[dict], used_ids: set[str]) -> dict:
     address_norm = address.lower()
@@ -30,59 +44,86 @@ def pick_property(address: str, properties: list[dict], used_ids: set[str]) -> d
     return properties[0]
 
 
-def map_features(prop: dict) -> dict:
-    title = str(prop.get("title", "")).lower()
-    amenities = [a.lower() for a in prop.get("amenities", [])]
-    size = prop.get("size") or prop.get("size_sqft") or 1800
-    property_type = "Condo" if "condo" in title or "apartment" in title else "SFH"
-    has_pool = any("pool" in a for a in amenities)
-    has_garage = any("garage" in a for a in amenities)
-    school_rating = _school_rating_from_location(prop.get("location", ""))
-    year_built = _year_from_price(prop.get("price"))
-
-    return {
-        "property_type": property_type,
-        "lot_area": int(size if property_type == "SFH" else 0),
-        "building_area": int(size if property_type == "Condo" else 0),
-        "bedrooms": int(prop.get("bedrooms") or 2),
-        "bathrooms": int(prop.get("bathrooms") or 1),
-        "year_built": year_built,
-        "has_pool": has_pool,
-        "has_garage": has_garage,
-        "school_rating": school_rating,
-    }
-
-
-def _school_rating_from_location(location: str) -> int:
-    city = location.lower()
-    table = {
-        "new york": 9,
-        "miami": 8,
-        "los angeles": 8,
-        "austin": 7,
-        "san francisco": 9,
-        "chicago": 7,
-        "dallas": 7,
-        "seattle": 9,
-        "boston": 9,
-    }
-    for key, rating in table.items():
-        if key in city:
-            return rating
-    return 7
-
-
-def _year_from_price(price) -> int:
-    try:
-        if price and price > 1000000:
-            return 2018
-        if price and price > 700000:
-            return 2015
-        if price and price > 400000:
-            return 2012
-        return 2008
-    except Exception:
-        return 2010
+def resolve_addresses(
+    addresses: list[str], properties: Sequence[dict], used_ids: set[str], index: AddressIndex
+) -> tuple[list[dict], list[str]]:
+    """Bulk version of `pick_property` backed by the loader's cached address index.
+
+    Returns the matched listings and the addresses that matched nothing;
+    unlike `pick_property` there is no arbitrary fallback. Cost depends on the
+    number of distinct locations and the address length, not the catalog size.
+    """
+    matched: list[dict] = []
+    unresolved: list[str] = []
+    for address in addresses:
+        address_norm = address.lower()
+        position = _first_unused(
+            properties,
+            used_ids,
+            (
+                positions
+                for loc, positions in index.by_location.items()
+                if loc in address_norm or address_norm in loc
+            ),
+        )
+        if position is None:
+            # Titles contained in the address: look up each substring up to the longest title
+            longest = index.max_title_length
+            titles = (
+                index.by_title.get(address_norm[i:j])
+                for i in range(len(address_norm))
+                for j in range(i + 1, min(len(address_norm), i + longest) + 1)
+            )
+            position = _first_unused(properties, used_ids, (positions for positions in titles if positions))
+        if position is None:
+            unresolved.append(address)
+            continue
+        prop = properties[position]
+        used_ids.add(prop["id"])
+        matched.append(prop)
+    return matched, unresolved
+
+
+def _first_unused(
+    properties: Sequence[dict], used_ids: set[str], position_lists: Iterable[list[int]]
+) -> int | None:
+    """Lowest catalog position not already used, keeping pick_property's catalog-order behaviour."""
+    best = None
+    for positions in position_lists:
+        for position in positions:
+            if best is not None and position >= best:
+                break
+            if properties[position]["id"] not in used_ids:
+                best = position
+                break
+    return best
+
+
+def predict_many(props: list[dict]) -> tuple[list[dict], list[float]]:
+    """Features and predicted prices for `props`, batching cache misses into one model call."""
+    global _prediction_cache_version, _prediction_cache_revision
+    data_loader.load()
+    changed = data_loader.changed_since(_prediction_cache_revision)
+    if _prediction_cache_version != data_loader.version or changed is None:
+        _prediction_cache.clear()
+    else:
+        for pid in changed:
+            _prediction_cache.pop(pid, None)
+    _prediction_cache_version = data_loader.version
+    _prediction_cache_revision = data_loader.revision
+
+    misses = [prop for prop in props if prop["id"] not in _prediction_cache]
+    if len(props) > len(misses):
+        record_cache("predictions", hit=True, amount=len(props) - len(misses))
+    if misses:
+        record_cache("predictions", hit=False, amount=len(misses))
+        features = [map_features(prop) for prop in misses]
+        predicted = price_model.predict_prices(features, [prop.get("price") for prop in misses])
+        for prop, feats, price in zip(misses, features, predicted):
+            _prediction_cache[prop["id"]] = (feats, price)
+
+    cached = [_prediction_cache[prop["id"]] for prop in props]
+    return [c[0] for c in cached], [c[1] for c in cached]
 
 
 @router.post("/predict", response_model=ComparePredictionResponse)
@@ -98,8 +139,7 @@ async def compare_predict(payload: CompareAddressesRequest) -> ComparePrediction
         predicted_price = price_model.predict_price(features, fallback_price=prop.get("price"))
         enriched.append(
             PredictedProperty(
-                **prop,
-                size_sqft=prop.get("size_sqft") or prop.get("size"),
+                **{**prop, "size_sqft": prop.get("size_sqft") or prop.get("size")},
                 predicted_price=predicted_price,
                 features=features,
             )
@@ -108,3 +148,43 @@ async def compare_predict(payload: CompareAddressesRequest) -> ComparePrediction
     return ComparePredictionResponse(properties=enriched)
 
 
+@router.post("/batch", response_model=CompareBatchResponse)
+async def compare_batch(payload: CompareBatchRequest) -> CompareBatchResponse:
+    properties = data_loader.load()
+    by_id = data_loader.by_id()
+
+    selected: list[dict] = []
+    used_ids: set[str] = set()
+    unresolved: list[str] = []
+    for pid in payload.property_ids:
+        prop = by_id.get(pid)
+        if prop is None:
+            unresolved.append(pid)
+        elif pid not in used_ids:
+            used_ids.add(pid)
+            selected.append(prop)
+    if payload.addresses:
+        matched, missing = resolve_addresses(
+            payload.addresses, properties, used_ids, data_loader.address_index()
+        )
+        selected.extend(matched)
+        unresolved.extend(missing)
+
+    features, predicted = predict_many(selected)
+    stats = compare_shortlist(selected, features, predicted)
+
+    enriched = [
+        BatchPredictedProperty(
+            **{**prop, "size_sqft": prop.get("size_sqft") or prop.get("size")},
+            predicted_price=predicted[i],
+            features=features[i],
+            price_delta=stats["price_delta"][i],
+            price_per_sqft=stats["price_per_sqft"][i],
+            feature_deltas=stats["feature_deltas"][i],
+            ranks=stats["ranks"][i],
+        )
+        for i, prop in enumerate(selected)
+    ]
+    return CompareBatchResponse(properties=enriched, medians=stats["medians"], unresolved=unresolved)
+
+
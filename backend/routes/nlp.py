@@ -1,16 +1,23 @@
 from fastapi import APIRouter, HTTPException
+from functools import lru_cache
 from pathlib import Path
 import os
 from backend.schemas import NLPRequest
-
-try:
-    from openai import OpenAI
-except ImportError:  # pragma: no cover - optional dependency
-    OpenAI = None  # type: ignore
+from backend.services.metrics import metrics, timed
 
 router = APIRouter(prefix="/nlp", tags=["nlp"])
 
 
+@lru_cache(maxsize=1)
+def _openai_client(api_key: str):
+    """Build the OpenAI client on first use; the SDK is heavy and only needed with a key."""
+    try:
+        from openai import OpenAI
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    return OpenAI(api_key=api_key)
+
+
 def load_txt_file(filename: str) -> str:
     """Load content from a text file in the backend/prompt directory."""
     # Get the backend directory (parent of routes directory)
@@ -112,35 +119,38 @@ def _has_searchable_filters(filters: dict) -> bool:
 
 @router.post("/parse")
 async def parse_intent(payload: NLPRequest) -> dict:
-    # PRIORITY 1: Try OpenAI LLM first if available
-    if OpenAI is not None:
+    # PRIORITY 1: Try OpenAI LLM first if an API key is configured
+    api_key = os.getenv("OPENAI_API_KEY")
+    fallback_reason = "no_api_key"
+    if api_key:
+        fallback_reason = "llm_error"
         try:
             import json
-            api_key = os.getenv("OPENAI_API_KEY")
-            if not api_key:
-                raise RuntimeError("OPENAI_API_KEY is not set in the environment")
-
-            client = OpenAI(api_key=api_key)
+            client = _openai_client(api_key)
+            if client is None:
+                fallback_reason = "openai_not_installed"
+                raise RuntimeError("openai package is not installed")
             
             # Load prompt from text file
             system_prompt = load_txt_file("chatbot.txt")
             
             # Use LLM to determine if query is searchable or conversational
             # Response format: {"filters": {...} OR null, "text": "..." OR null}
-            completion = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": system_prompt,
-                    },
-                    {
-                        "role": "user",
-                        "content": payload.text
-                    }
-                ],
-                response_format={"type": "json_object"},
-            )
+            with timed("llm_call"):
+                completion = client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": system_prompt,
+                        },
+                        {
+                            "role": "user",
+                            "content": payload.text
+                        }
+                    ],
+                    response_format={"type": "json_object"},
+                )
             message_content = completion.choices[0].message.content
             print(f"LLM Response: {message_content}")
             
@@ -170,6 +180,7 @@ async def parse_intent(payload: NLPRequest) -> dict:
             pass
     
     # PRIORITY 2: Fallback to heuristic if LLM not available or failed
+    metrics.inc("llm_fallbacks_total", reason=fallback_reason)
     filters = _heuristic_fallback(payload.text)
     if _has_searchable_filters(filters):
         return {"filters": filters, "provider": "fallback"}
@@ -1,14 +1,23 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import ValidationError
 from typing import Union
 
+from backend.dependencies import require_admin
 from backend.schemas import (
+    CatalogChangesRequest,
+    CatalogChangesResponse,
     Property,
     PropertySearchRequest,
     PropertySearchResponse,
     CompareRequest,
 )
+from backend.services.changes import append_changes
 from backend.services.data_loader import PropertyDataLoader
+from backend.services.facets import compute_facets, parse_facets, select_facets
 from backend.services.filter import apply_filters, paginate
+from backend.services.geo import geo_search, resolve_point
+from backend.services.metrics import timed
+from backend.services.shared_catalog import SharedRows
 
 
 router = APIRouter(prefix="/properties", tags=["properties"])
@@ -23,14 +32,42 @@ async def search_properties(
     min_bedrooms: int | None = None,
     min_bathrooms: int | None = None,
     amenities: list[str] | None = Query(None),
+    near: str | None = None,
+    radius_km: float | None = Query(None, gt=0),
+    min_lat: float | None = None,
+    max_lat: float | None = None,
+    min_lon: float | None = None,
+    max_lon: float | None = None,
     sort_by: str = "price",
     sort_order: str = "asc",
     page: int = 1,
     page_size: int = 10,
-) -> PropertySearchResponse:
-    properties = data_loader.load()
-    filtered = apply_filters(
-        properties,
+    facets: list[str] | None = Query(None),
+) -> Response:
+    try:
+        facet_names = parse_facets(facets)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    center = None
+    if near:
+        center = resolve_point(near)
+        if center is None:
+            raise HTTPException(status_code=400, detail=f"Could not geocode near={near!r}")
+    elif radius_km is not None:
+        raise HTTPException(status_code=400, detail="radius_km requires near")
+
+    bbox = None
+    bbox_parts = (min_lat, min_lon, max_lat, max_lon)
+    if any(part is not None for part in bbox_parts):
+        if any(part is None for part in bbox_parts):
+            raise HTTPException(
+                status_code=400,
+                detail="Bounding-box search needs min_lat, max_lat, min_lon and max_lon",
+            )
+        bbox = bbox_parts
+
+    filters = dict(
         location=location,
         min_price=min_price,
         max_price=max_price,
@@ -40,29 +77,91 @@ async def search_properties(
         sort_by=sort_by,
         sort_order=sort_order,
     )
+    if center is not None or bbox is not None:
+        properties = data_loader.load()
+        geo_index = data_loader.geo_index()
+        with timed("geo_search"):
+            properties = geo_search(properties, geo_index, center=center, radius_km=radius_km, bbox=bbox)
+        with timed("filter"):
+            filtered = apply_filters(properties, **filters)
+    else:
+        filtered = data_loader.search(**filters)
     total = len(filtered)
-    paged = paginate(filtered, page, page_size)
-    return PropertySearchResponse(
-        total=total,
-        page=page,
-        page_size=page_size,
-        results=[Property(**item) for item in paged],
+
+    facet_counts = None
+    if facet_names:
+        unfiltered = not any(
+            (location, min_price is not None, max_price is not None, min_bedrooms is not None,
+             min_bathrooms is not None, amenities, center, bbox)
+        )
+        if unfiltered:
+            facet_counts = select_facets(data_loader.facets(), facet_names)
+        else:
+            with timed("facets"):
+                if isinstance(filtered, SharedRows):
+                    facet_counts = filtered.facets(facet_names)
+                else:
+                    facet_counts = compute_facets(filtered, facet_names)
+
+    with timed("paginate"):
+        paged = paginate(filtered, page, page_size)
+    # Rendered here so the stage covers validation and JSON encoding; FastAPI
+    # passes a Response through without re-validating it against response_model
+    with timed("serialize"):
+        body = PropertySearchResponse(
+            total=total,
+            page=page,
+            page_size=page_size,
+            results=[Property(**item) for item in paged],
+            facets=facet_counts,
+        )
+        return Response(content=body.model_dump_json(), media_type="application/json")
+
+
+@router.post("/changes", response_model=CatalogChangesResponse, dependencies=[Depends(require_admin)])
+async def ingest_changes(payload: CatalogChangesRequest) -> CatalogChangesResponse:
+    """Upsert/delete listings by appending to the catalog change log."""
+    by_id = data_loader.by_id()
+    pending: dict[str, dict | None] = {}
+    changes = []
+    for change in payload.changes:
+        if change.op == "delete":
+            pending[change.id] = None
+            changes.append({"op": "delete", "id": change.id})
+            continue
+        # Only fields the client sent, already coerced to the column types
+        fields = change.fields.model_dump(exclude_unset=True)
+        changes.append({"op": "upsert", "id": change.id, "fields": fields})
+        base = pending[change.id] if change.id in pending else by_id.get(change.id)
+        row = {**(base or {}), **fields, "id": change.id}
+        try:
+            Property(**row)
+        except ValidationError as exc:
+            errors = "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors())
+            raise HTTPException(status_code=400, detail=f"Invalid upsert for {change.id!r}: {errors}")
+        pending[change.id] = row
+
+    accepted = append_changes(data_loader.data_dir, changes)
+    properties = data_loader.load()
+    return CatalogChangesResponse(
+        accepted=accepted,
+        applied=not data_loader.shared,
+        revision=data_loader.revision,
+        total=len(properties),
     )
 
 
 @router.get("/{property_id}", response_model=Property)
 async def get_property(property_id: str) -> Property:
-    properties = data_loader.load()
-    for item in properties:
-        if item["id"] == property_id:
-            return Property(**item)
+    item = data_loader.by_id().get(property_id)
+    if item is not None:
+        return Property(**item)
     raise HTTPException(status_code=404, detail="Property not found")
 
 
 @router.post("/compare", response_model=list[Property])
 async def compare_properties(payload: CompareRequest) -> list[Property]:
-    properties = data_loader.load()
-    by_id = {p["id"]: p for p in properties}
+    by_id = data_loader.by_id()
     results = []
     for pid in payload.property_ids:
         prop = by_id.get(pid)
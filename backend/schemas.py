@@ -1,5 +1,5 @@
-from typing import List, Optional, Any, Dict
-from pydantic import BaseModel, Field
+from typing import Annotated, ClassVar, List, Literal, Optional, Any, Dict
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 class Property(BaseModel):
@@ -13,6 +13,9 @@ class Property(BaseModel):
     size_sqft: Optional[float] = None
     amenities: List[str] = Field(default_factory=list)
     images: List[str] = Field(default_factory=list)
+    lat: Optional[float] = None
+    lon: Optional[float] = None
+    distance_km: Optional[float] = None
 
 
 class PropertySearchRequest(BaseModel):
@@ -22,6 +25,12 @@ class PropertySearchRequest(BaseModel):
     min_bedrooms: Optional[int] = None
     min_bathrooms: Optional[int] = None
     amenities: Optional[List[str]] = None
+    near: Optional[str] = None
+    radius_km: Optional[float] = None
+    min_lat: Optional[float] = None
+    max_lat: Optional[float] = None
+    min_lon: Optional[float] = None
+    max_lon: Optional[float] = None
     sort_by: str = "price"
     sort_order: str = "asc"
     page: int = 1
@@ -33,6 +42,7 @@ class PropertySearchResponse(BaseModel):
     page: int
     page_size: int
     results: List[Property]
+    facets: Optional[Dict[str, Any]] = None
 
 
 class SavePropertyRequest(BaseModel):
@@ -61,6 +71,74 @@ class ComparePredictionResponse(BaseModel):
     properties: List[PredictedProperty]
 
 
+# Address matching looks up substrings of each address, so its length is capped
+Address = Annotated[str, Field(max_length=200)]
+
+
+class CompareBatchRequest(BaseModel):
+    property_ids: List[str] = Field(default_factory=list, max_length=100)
+    addresses: List[Address] = Field(default_factory=list, max_length=100)
+
+
+class BatchPredictedProperty(PredictedProperty):
+    price_delta: Optional[float] = None
+    price_per_sqft: Optional[float] = None
+    feature_deltas: Dict[str, Optional[float]] = Field(default_factory=dict)
+    ranks: Dict[str, Optional[int]] = Field(default_factory=dict)
+
+
+class CompareBatchResponse(BaseModel):
+    properties: List[BatchPredictedProperty]
+    medians: Dict[str, Optional[float]] = Field(default_factory=dict)
+    unresolved: List[str] = Field(default_factory=list)
+
+
+class ListingFields(BaseModel):
+    """Columns an upsert may set; omitted fields are left as they are."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    # Filtered/sorted (or required) columns: apply_filters can't compare a null
+    NOT_NULL: ClassVar[tuple] = ("title", "price", "location", "bedrooms", "bathrooms", "amenities", "images")
+
+    title: Optional[str] = None
+    price: Optional[float] = Field(None, ge=0)
+    location: Optional[str] = None
+    bedrooms: Optional[int] = Field(None, ge=0)
+    bathrooms: Optional[int] = Field(None, ge=0)
+    size: Optional[float] = Field(None, ge=0)
+    size_sqft: Optional[float] = Field(None, ge=0)
+    amenities: Optional[List[str]] = None
+    images: Optional[List[str]] = None
+    lat: Optional[float] = Field(None, ge=-90, le=90)
+    lon: Optional[float] = Field(None, ge=-180, le=180)
+
+    @model_validator(mode="after")
+    def _reject_nulls(self) -> "ListingFields":
+        nulls = [name for name in self.NOT_NULL if name in self.model_fields_set and getattr(self, name) is None]
+        if nulls:
+            raise ValueError(f"{', '.join(nulls)} cannot be null")
+        return self
+
+
+class CatalogChange(BaseModel):
+    op: Literal["upsert", "delete"]
+    id: str
+    fields: ListingFields = Field(default_factory=ListingFields)
+
+
+class CatalogChangesRequest(BaseModel):
+    changes: List[CatalogChange] = Field(min_length=1, max_length=1000)
+
+
+class CatalogChangesResponse(BaseModel):
+    accepted: int
+    # False in shared mode: changes are picked up when the next snapshot is published
+    applied: bool
+    revision: int
+    total: int
+
+
 class NLPRequest(BaseModel):
     text: str
 
@@ -0,0 +1,83 @@
+"""Append-only JSONL change log for incremental catalog updates.
+
+Each line of `changes.jsonl` in the data directory is one batch of changes:
+
+    {"ts": 1760000000.0, "changes": [{"op": "upsert", "id": "11", "fields": {"price": 410000}},
+                                     {"op": "delete", "id": "4"}]}
+
+An upsert of an existing id patches the listed fields; an upsert of a new id
+adds a listing. Loaders tail the file by byte offset and apply only complete
+new lines, so every worker converges on the same catalog without re-reading
+the base JSON files, and a batch is applied either whole or not at all. Each
+batch is written with a single append.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from backend.services.metrics import metrics
+
+CHANGES_FILE = "changes.jsonl"
+OPS = ("upsert", "delete")
+
+_count_bad_line = metrics.counter("catalog_change_errors_total", reason="bad_line")
+
+
+def changes_path(data_dir: Path) -> Path:
+    return Path(data_dir) / CHANGES_FILE
+
+
+def append_changes(data_dir: Path, changes: Iterable[Dict[str, Any]]) -> int:
+    """Append one batch of changes to the log; returns how many were written."""
+    batch = []
+    for change in changes:
+        if change.get("op") not in OPS:
+            raise ValueError(f"change op must be one of {OPS}, got {change.get('op')!r}")
+        entry = {"op": change["op"], "id": str(change["id"])}
+        if change["op"] == "upsert":
+            entry["fields"] = {k: v for k, v in (change.get("fields") or {}).items() if k != "id"}
+        batch.append(entry)
+    if batch:
+        line = json.dumps({"ts": time.time(), "changes": batch}, separators=(",", ":")) + "\n"
+        # Unbuffered append: the whole batch goes out in one O_APPEND write
+        with changes_path(data_dir).open("ab", buffering=0) as f:
+            f.write(line.encode("utf-8"))
+    return len(batch)
+
+
+def read_changes(path: Path, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+    """Changes from complete batches appended after byte `offset`, and the offset to resume from.
+
+    A trailing line without a newline is a batch still being written and is
+    left for the next read. A malformed batch is skipped as a whole.
+    """
+    with Path(path).open("rb") as f:
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b"\n") + 1
+    changes = []
+    for line in data[:end].splitlines():
+        if not line.strip():
+            continue
+        batch = _parse_batch(line)
+        if batch is None:
+            _count_bad_line()
+            continue
+        changes.extend(batch)
+    return changes, offset + end
+
+
+def _parse_batch(line: bytes) -> Optional[List[Dict[str, Any]]]:
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    batch = entry.get("changes") if isinstance(entry, dict) else None
+    if not isinstance(batch, list):
+        return None
+    for change in batch:
+        if not isinstance(change, dict) or change.get("op") not in OPS or "id" not in change:
+            return None
+    return batch
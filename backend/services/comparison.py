@@ -0,0 +1,76 @@
+from statistics import median
+from typing import Any, Dict, List, Optional, Sequence
+
+# Model features that are meaningful to diff between listings
+NUMERIC_FEATURES = ["lot_area", "building_area", "bedrooms", "bathrooms", "year_built", "school_rating"]
+
+
+def _column(rows: Sequence[Dict[str, Any]], key: str) -> List[Optional[float]]:
+    column = []
+    for row in rows:
+        value = row.get(key)
+        column.append(float(value) if isinstance(value, (int, float)) else None)
+    return column
+
+
+def _ranks(values: Sequence[Optional[float]], descending: bool) -> List[Optional[int]]:
+    """Dense 1-based ranks; rows without a value are left unranked."""
+    present = sorted({v for v in values if v is not None}, reverse=descending)
+    position = {v: i + 1 for i, v in enumerate(present)}
+    return [position[v] if v is not None else None for v in values]
+
+
+def _deltas(values: Sequence[Optional[float]]) -> List[Optional[float]]:
+    present = [v for v in values if v is not None]
+    if not present:
+        return [None] * len(values)
+    center = median(present)
+    return [round(v - center, 2) if v is not None else None for v in values]
+
+
+def compare_shortlist(
+    properties: Sequence[Dict[str, Any]],
+    features: Sequence[Dict[str, Any]],
+    predicted_prices: Sequence[float],
+) -> Dict[str, Any]:
+    """Per-listing deltas and rankings for an N-way comparison.
+
+    Works column-wise: each metric is extracted once across the shortlist,
+    so cost is a handful of passes over N rather than N×N pairwise diffs.
+    Feature deltas are relative to the shortlist median.
+    """
+    n = len(properties)
+    listed = _column(properties, "price")
+    sizes = [p.get("size") or p.get("size_sqft") for p in properties]
+    predicted = [float(p) for p in predicted_prices]
+    value_gap = [pred - lp if lp is not None else None for pred, lp in zip(predicted, listed)]
+    price_per_sqft = [
+        round(lp / size, 2) if lp is not None and size else None for lp, size in zip(listed, sizes)
+    ]
+
+    feature_deltas: List[Dict[str, Optional[float]]] = [{} for _ in range(n)]
+    medians: Dict[str, Optional[float]] = {}
+    columns = {name: _column(features, name) for name in NUMERIC_FEATURES}
+    columns["price"] = listed
+    columns["predicted_price"] = predicted
+    for name, column in columns.items():
+        present = [v for v in column if v is not None]
+        medians[name] = median(present) if present else None
+        for i, delta in enumerate(_deltas(column)):
+            feature_deltas[i][name] = delta
+
+    rank_columns = {
+        "predicted_price": _ranks(predicted, descending=True),
+        # Largest positive gap = most undervalued relative to the model
+        "value": _ranks(value_gap, descending=True),
+        "price_per_sqft": _ranks(price_per_sqft, descending=False),
+    }
+    ranks = [{name: col[i] for name, col in rank_columns.items()} for i in range(n)]
+
+    return {
+        "price_delta": [round(v, 2) if v is not None else None for v in value_gap],
+        "price_per_sqft": price_per_sqft,
+        "feature_deltas": feature_deltas,
+        "ranks": ranks,
+        "medians": medians,
+    }
@@ -1,53 +1,505 @@
 import json
+import threading
+from bisect import bisect_left, insort
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, Iterator, List, Any, Mapping, NamedTuple, Optional, Sequence, Set, Tuple
 
 from backend.config import get_settings
+from backend.services.changes import changes_path, read_changes
+from backend.services.facets import FacetCounts
+from backend.services.filter import apply_filters
+from backend.services.geo import GridIndex, geocode
+from backend.services.metrics import record_cache, timed
+from backend.services.shared_catalog import SharedCatalog, SharedCatalogReader
+
+
+class AddressIndex(NamedTuple):
+    """Lower-cased location and title -> catalog positions, ascending."""
+
+    by_location: Dict[str, List[int]]
+    by_title: Dict[str, List[int]]
+    max_title_length: int
 
 
 class PropertyDataLoader:
-    def __init__(self, data_dir: str | None = None) -> None:
+    def __init__(self, data_dir: str | None = None, snapshot_dir: str | None = None) -> None:
         settings = get_settings()
         self.data_dir = Path(data_dir or settings.data_dir)
-        self._cache: List[Dict[str, Any]] | None = None
+        # An explicit data_dir always means "read these files"; otherwise follow CATALOG_MODE
+        if snapshot_dir is None and data_dir is None and settings.catalog_mode == "shared":
+            snapshot_dir = settings.catalog_snapshot_dir
+        self._shared = SharedCatalogReader(Path(snapshot_dir)) if snapshot_dir else None
+        self._cache: Sequence[Dict[str, Any]] | None = None
+        self._geo_index: GridIndex | None = None
+        self._by_id: Mapping[str, Dict[str, Any]] | None = None
+        self._facets: Dict[str, Any] | None = None
+        self._facet_counts: FacetCounts | None = None
+        self._positions: Dict[str, int] | None = None
+        self._address_index: AddressIndex | None = None
+        # Bumped on every (re)load so derived caches can tell they are stale
+        self.version = 0
+        # Bumped per applied change batch; derived caches use changed_since()
+        # to drop only the listings that changed
+        self.revision = 0
+        self._history: deque = deque(maxlen=256)
+        self._log_offset = 0
+        self._lock = threading.Lock()
 
-    def load(self, force_reload: bool = False) -> List[Dict[str, Any]]:
+    @property
+    def shared(self) -> bool:
+        return self._shared is not None
+
+    def load(self, force_reload: bool = False) -> Sequence[Dict[str, Any]]:
+        if self._shared is not None:
+            return self._attach_shared(force_reload)
         if self._cache is not None and not force_reload:
+            record_cache("catalog", hit=True)
+            self._apply_pending_changes()
             return self._cache
+        record_cache("catalog", hit=False)
+
+        with timed("catalog_load"):
+            basics = self._read_json("property_basics.json")
+            characteristics = self._read_json("property_characteristics.json")
+            images = self._read_json("property_images.json")
+
+            characteristics_by_id = {str(item["id"]): item for item in characteristics}
+            images_by_id = {str(item["id"]): item for item in images}
 
-        basics = self._read_json("property_basics.json")
-        characteristics = self._read_json("property_characteristics.json")
-        images = self._read_json("property_images.json")
-
-        characteristics_by_id = {str(item["id"]): item for item in characteristics}
-        images_by_id = {str(item["id"]): item for item in images}
-
-        merged: List[Dict[str, Any]] = []
-        for basic in basics:
-            pid = str(basic["id"])
-            basic["id"] = pid
-            characteristic = characteristics_by_id.get(pid, {})
-            image_block = images_by_id.get(pid, {})
-            image_url = image_block.get("image_url")
-            images_list = image_block.get("images") or ([image_url] if image_url else [])
-            size_value = characteristic.get("size") or characteristic.get("size_sqft")
-            # Exclude 'id' from characteristic and image_block to avoid overwriting the string id
-            characteristic_clean = {k: v for k, v in characteristic.items() if k != "id"}
-            merged.append(
-                {
-                    **basic,
-                    **characteristic_clean,
-                    "size": size_value,
-                    "size_sqft": size_value,
-                    "images": images_list,
-                }
-            )
+            merged = [self._merge(basic, characteristics_by_id, images_by_id) for basic in basics]
+            # Built with the catalog so no change batch pays the O(catalog) cost
+            positions = {p["id"]: i for i, p in enumerate(merged)}
 
         self._cache = merged
+        self._geo_index = None
+        self._by_id = None
+        self._facets = None
+        self._facet_counts = None
+        self._positions = positions
+        self._address_index = None
+        self._log_offset = 0
+        self.version += 1
+        self._apply_pending_changes()
         return merged
 
+    def _attach_shared(self, force_reload: bool) -> SharedCatalog:
+        if force_reload:
+            self._shared.recheck()
+        catalog = self._shared.current()
+        record_cache("catalog", hit=catalog is self._cache)
+        if catalog is not self._cache:
+            self._cache = catalog
+            self._geo_index = None
+            self._by_id = None
+            self._facets = None
+            self._address_index = None
+            self.version += 1
+        return catalog
+
+    def _apply_pending_changes(self) -> None:
+        """Apply change-log lines appended since the last call (one stat() when there are none)."""
+        try:
+            size = changes_path(self.data_dir).stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size == self._log_offset:
+            return
+        if size < self._log_offset:
+            # Log was truncated or rotated; the base files are the only safe starting point
+            self.load(force_reload=True)
+            return
+        with self._lock:
+            changes, self._log_offset = read_changes(changes_path(self.data_dir), self._log_offset)
+            if changes:
+                self.apply_changes(changes)
+
+    def apply_changes(self, changes: List[Dict[str, Any]]) -> Set[str]:
+        """Apply upserts/deletes to the catalog and its indexes in place; returns changed ids.
+
+        Work is proportional to the number of changes. Deleted rows are
+        replaced by the last row so positions in the geo index stay dense.
+        Changed rows are new dicts rather than mutated ones, and a batch is
+        applied between requests on the event loop, so a request never sees
+        half of a batch.
+        """
+        catalog = self._cache
+        if self._positions is None:
+            self._positions = {p["id"]: i for i, p in enumerate(catalog)}
+        positions = self._positions
+        by_id = self._by_id
+        index = self._geo_index
+        counts = self._facet_counts
+        addresses = self._address_index
+        longest_title = addresses.max_title_length if addresses is not None else 0
+        changed: Set[str] = set()
+
+        with timed("catalog_apply_changes"):
+            for change in changes:
+                pid = str(change["id"])
+                pos = positions.get(pid)
+                if change["op"] == "delete":
+                    if pos is None:
+                        continue
+                    last = len(catalog) - 1
+                    _unindex(index, catalog[pos], pos)
+                    _unindex_address(addresses, catalog[pos], pos)
+                    if counts is not None:
+                        counts.remove(catalog[pos])
+                    if pos != last:
+                        moved = catalog[last]
+                        _unindex(index, moved, last)
+                        _index(index, moved, pos)
+                        _unindex_address(addresses, moved, last)
+                        _index_address(addresses, moved, pos)
+                        catalog[pos] = moved
+                        positions[moved["id"]] = pos
+                    catalog.pop()
+                    del positions[pid]
+                    if by_id is not None:
+                        by_id.pop(pid, None)
+                else:
+                    base = catalog[pos] if pos is not None else {"id": pid, "amenities": [], "images": []}
+                    row = self._patch(base, change.get("fields") or {})
+                    if pos is None:
+                        positions[pid] = len(catalog)
+                        catalog.append(row)
+                        _index(index, row, positions[pid])
+                        _index_address(addresses, row, positions[pid])
+                    else:
+                        old = catalog[pos]
+                        # Price-only and other non-geo edits leave the grid alone
+                        if (old.get("lat"), old.get("lon")) != (row.get("lat"), row.get("lon")):
+                            _unindex(index, old, pos)
+                            _index(index, row, pos)
+                        if (old.get("location"), old.get("title")) != (row.get("location"), row.get("title")):
+                            _unindex_address(addresses, old, pos)
+                            _index_address(addresses, row, pos)
+                        if counts is not None:
+                            counts.remove(old)
+                        catalog[pos] = row
+                    if counts is not None:
+                        counts.add(row)
+                    if row.get("title"):
+                        longest_title = max(longest_title, len(str(row["title"])))
+                    if by_id is not None:
+                        by_id[pid] = row
+                changed.add(pid)
+
+        if changed:
+            # Counts are already current; only the rendered result (and its median) is redone
+            self._facets = None
+            if addresses is not None and longest_title > addresses.max_title_length:
+                self._address_index = addresses._replace(max_title_length=longest_title)
+            self.revision += 1
+            self._history.append((self.revision, frozenset(changed)))
+        return changed
+
+    def changed_since(self, revision: int) -> Optional[Set[str]]:
+        """Ids changed after `revision`, or None if that is too far back to know."""
+        if revision == self.revision:
+            return set()
+        if not self._history or self._history[0][0] > revision + 1:
+            return None
+        changed: Set[str] = set()
+        for rev, ids in self._history:
+            if rev > revision:
+                changed |= ids
+        return changed
+
+    def search(
+        self,
+        location: Optional[str | List[str]] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        min_bedrooms: Optional[int] = None,
+        min_bathrooms: Optional[int] = None,
+        amenities: Optional[List[str]] = None,
+        sort_by: str = "price",
+        sort_order: str = "asc",
+    ) -> Sequence[Dict[str, Any]]:
+        """Filtered, sorted listings; equivalent to `apply_filters` over the catalog.
+
+        A shared catalog is filtered and sorted on its columns and returns a
+        lazy sequence, so only the rows that are read (usually just the
+        requested page, or every match when facets are requested) get decoded.
+        """
+        filters = dict(
+            location=location,
+            min_price=min_price,
+            max_price=max_price,
+            min_bedrooms=min_bedrooms,
+            min_bathrooms=min_bathrooms,
+            sort_by=sort_by,
+            sort_order=sort_order,
+        )
+        properties = self.load()
+        # One "filter" stage covers filtering and sorting on both paths
+        with timed("filter"):
+            if not isinstance(properties, SharedCatalog):
+                return apply_filters(properties, amenities=amenities, **filters)
+            return properties.search(amenities=amenities, **filters)
+
+    def iter_chunks(self, chunk_size: int = 5000) -> Iterator[List[Dict[str, Any]]]:
+        """Stream merged listings in chunks without building the whole catalog.
+
+        `property_basics.json` is parsed incrementally; the characteristics and
+        images files are indexed by id up front since rows are looked up by id.
+        The change log is folded into a per-id overlay first and applied as
+        rows stream past; ids it adds come after the base listings.
+        """
+        characteristics_by_id = {str(item["id"]): item for item in self._read_json("property_characteristics.json")}
+        images_by_id = {str(item["id"]): item for item in self._read_json("property_images.json")}
+        overlay = self._change_overlay()
+
+        def rows() -> Iterator[Dict[str, Any]]:
+            for basic in iter_json_array(self.data_dir / "property_basics.json"):
+                row = self._merge(basic, characteristics_by_id, images_by_id)
+                yield row if row["id"] not in overlay else self._overlaid(row, row["id"], overlay.pop(row["id"]))
+            # Whatever the overlay still holds are ids the log added
+            for pid, entry in overlay.items():
+                yield self._overlaid(None, pid, entry)
+
+        chunk: List[Dict[str, Any]] = []
+        for row in rows():
+            if row is None:
+                continue
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _change_overlay(self) -> Dict[str, Optional[Tuple[bool, List[Dict[str, Any]]]]]:
+        """id -> final state from the change log: None if deleted, else (replaces_base, field patches)."""
+        path = changes_path(self.data_dir)
+        if not path.exists():
+            return {}
+        changes, _ = read_changes(path)
+        overlay: Dict[str, Optional[Tuple[bool, List[Dict[str, Any]]]]] = {}
+        for change in changes:
+            pid = str(change["id"])
+            if change["op"] == "delete":
+                overlay[pid] = None
+                continue
+            entry = overlay.get(pid, (False, []))
+            if entry is None:
+                # Re-added after a delete: starts from scratch, like apply_changes
+                entry = (True, [])
+            entry[1].append(change.get("fields") or {})
+            overlay[pid] = entry
+        return overlay
+
+    def _overlaid(
+        self,
+        base: Optional[Dict[str, Any]],
+        pid: str,
+        entry: Optional[Tuple[bool, List[Dict[str, Any]]]],
+    ) -> Optional[Dict[str, Any]]:
+        if entry is None:
+            return None
+        replaces_base, patches = entry
+        row = base if base is not None and not replaces_base else {"id": pid, "amenities": [], "images": []}
+        # Patched in log order so location/coordinate and size rules match apply_changes
+        for fields in patches:
+            row = self._patch(row, fields)
+        return row
+
+    def by_id(self) -> Mapping[str, Dict[str, Any]]:
+        properties = self.load()
+        record_cache("catalog_by_id", hit=self._by_id is not None)
+        if self._by_id is None:
+            if isinstance(properties, SharedCatalog):
+                self._by_id = properties.by_id()
+            else:
+                self._by_id = {p["id"]: p for p in properties}
+        return self._by_id
+
+    def geo_index(self) -> GridIndex:
+        properties = self.load()
+        record_cache("geo_index", hit=self._geo_index is not None)
+        if self._geo_index is None:
+            with timed("geo_index_build"):
+                if isinstance(properties, SharedCatalog):
+                    self._geo_index = properties.geo_index()
+                else:
+                    self._geo_index = GridIndex.build(properties)
+        return self._geo_index
+
+    def address_index(self) -> AddressIndex:
+        """Location/title lookup for address resolution; patched in place as changes apply."""
+        properties = self.load()
+        record_cache("address_index", hit=self._address_index is not None)
+        if self._address_index is None:
+            with timed("address_index_build"):
+                self._address_index = _build_address_index(properties)
+        return self._address_index
+
+    def facets(self) -> Dict[str, Any]:
+        """Every facet for the unfiltered catalog; counts are kept current as changes apply."""
+        properties = self.load()
+        record_cache("catalog_facets", hit=self._facets is not None)
+        if self._facets is None:
+            if isinstance(properties, SharedCatalog):
+                self._facets = properties.facets
+            else:
+                if self._facet_counts is None:
+                    with timed("facets"):
+                        self._facet_counts = FacetCounts()
+                        self._facet_counts.add_all(properties)
+                self._facets = self._facet_counts.result()
+        return self._facets
+
+    @staticmethod
+    def _merge(
+        basic: Dict[str, Any],
+        characteristics_by_id: Dict[str, Dict[str, Any]],
+        images_by_id: Dict[str, Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        pid = str(basic["id"])
+        basic["id"] = pid
+        characteristic = characteristics_by_id.get(pid, {})
+        image_block = images_by_id.get(pid, {})
+        image_url = image_block.get("image_url")
+        images_list = image_block.get("images") or ([image_url] if image_url else [])
+        size_value = characteristic.get("size") or characteristic.get("size_sqft")
+        # Exclude 'id' from characteristic and image_block to avoid overwriting the string id
+        characteristic_clean = {k: v for k, v in characteristic.items() if k != "id"}
+        row = {
+            **basic,
+            **characteristic_clean,
+            "size": size_value,
+            "size_sqft": size_value,
+            "images": images_list,
+        }
+        # Explicit coordinates in the data files win; otherwise geocode the city
+        _fill_coordinates(row)
+        return row
+
+    @staticmethod
+    def _patch(base: Dict[str, Any], fields: Dict[str, Any]) -> Dict[str, Any]:
+        row = {**base, **fields, "id": base["id"]}
+        if "size" in fields or "size_sqft" in fields:
+            row["size"] = row["size_sqft"] = fields.get("size", fields.get("size_sqft"))
+        if "location" in fields and not ("lat" in fields and "lon" in fields):
+            row["lat"] = row["lon"] = None
+        _fill_coordinates(row)
+        return row
+
     def _read_json(self, filename: str) -> List[Dict[str, Any]]:
         file_path = self.data_dir / filename
         with file_path.open("r", encoding="utf-8") as f:
             return json.load(f)
 
+
+def _build_address_index(properties: Sequence[Dict[str, Any]]) -> AddressIndex:
+    by_location: Dict[str, List[int]] = {}
+    by_title: Dict[str, List[int]] = {}
+    if isinstance(properties, SharedCatalog):
+        # Locations come from the code column, without decoding rows
+        names = [loc.lower() for loc in properties.locations]
+        for position, code in enumerate(properties.location_codes):
+            if names[code]:
+                by_location.setdefault(names[code], []).append(position)
+        for position, item in enumerate(properties):
+            if item.get("title"):
+                by_title.setdefault(str(item["title"]).lower(), []).append(position)
+    else:
+        for position, item in enumerate(properties):
+            loc = str(item.get("location", "")).lower()
+            if loc:
+                by_location.setdefault(loc, []).append(position)
+            if item.get("title"):
+                by_title.setdefault(str(item["title"]).lower(), []).append(position)
+    return AddressIndex(by_location, by_title, max(map(len, by_title), default=0))
+
+
+def _index_address(index: AddressIndex | None, row: Dict[str, Any], position: int) -> None:
+    if index is None:
+        return
+    for lookup, key in ((index.by_location, row.get("location")), (index.by_title, row.get("title"))):
+        if key:
+            insort(lookup.setdefault(str(key).lower(), []), position)
+
+
+def _unindex_address(index: AddressIndex | None, row: Dict[str, Any], position: int) -> None:
+    if index is None:
+        return
+    for lookup, key in ((index.by_location, row.get("location")), (index.by_title, row.get("title"))):
+        found = lookup.get(str(key).lower()) if key else None
+        if found is None:
+            continue
+        i = bisect_left(found, position)
+        if i < len(found) and found[i] == position:
+            found.pop(i)
+        if not found:
+            del lookup[str(key).lower()]
+
+
+def _fill_coordinates(row: Dict[str, Any]) -> None:
+    if row.get("lat") is None or row.get("lon") is None:
+        point = geocode(row.get("location"))
+        row["lat"], row["lon"] = point if point else (None, None)
+
+
+def _index(index: GridIndex | None, row: Dict[str, Any], position: int) -> None:
+    if index is not None and row.get("lat") is not None and row.get("lon") is not None:
+        index.add(float(row["lat"]), float(row["lon"]), position)
+
+
+def _unindex(index: GridIndex | None, row: Dict[str, Any], position: int) -> None:
+    if index is not None and row.get("lat") is not None and row.get("lon") is not None:
+        index.remove(float(row["lat"]), float(row["lon"]), position)
+
+
+def iter_json_array(path: Path, read_size: int = 1 << 20) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array one at a time."""
+    decoder = json.JSONDecoder()
+    whitespace = " \t\n\r"
+    with path.open("r", encoding="utf-8") as f:
+        buffer = ""
+        pos = 0
+        started = False
+        eof = False
+
+        def refill() -> None:
+            nonlocal buffer, pos, eof
+            chunk = f.read(read_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in whitespace:
+                pos += 1
+            if pos == len(buffer):
+                if eof:
+                    raise ValueError(f"{path}: unexpected end of JSON array")
+                refill()
+                continue
+            char = buffer[pos]
+            if not started:
+                if char != "[":
+                    raise ValueError(f"{path} does not contain a JSON array")
+                started = True
+                pos += 1
+                continue
+            if char == ",":
+                pos += 1
+                continue
+            if char == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                refill()
+                continue
+            # A number at the very end of the buffer may have been cut short
+            if end == len(buffer) and not eof:
+                refill()
+                continue
+            yield item
+            pos = end
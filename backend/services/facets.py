@@ -0,0 +1,137 @@
+"""Facet counts and price aggregates for a set of listings.
+
+All requested facets are accumulated in a single pass over the listings, so
+asking for every facet costs one extra walk over the matched set rather than
+one search per facet. Bucket edges are fixed so counts stay comparable as the
+user narrows a search.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from typing import Any, Collection, Dict, Iterable, List, Optional
+
+FACETS = ("city", "bedrooms", "price", "amenities")
+BEDROOM_BUCKETS = ("0", "1", "2", "3", "4", "5+")
+PRICE_EDGES = (0, 250_000, 500_000, 750_000, 1_000_000, 2_000_000)
+
+
+def parse_facets(values: Optional[List[str]]) -> List[str]:
+    """Normalise `facets=` values ("city,price" or repeated params; "all" for every facet)."""
+    names: List[str] = []
+    for value in values or []:
+        for name in value.split(","):
+            name = name.strip().lower()
+            if not name:
+                continue
+            if name == "all":
+                return list(FACETS)
+            if name not in FACETS:
+                raise ValueError(f"Unknown facet {name!r}; expected one of {', '.join(FACETS)} or all")
+            if name not in names:
+                names.append(name)
+    return names
+
+
+def compute_facets(properties: Iterable[Dict[str, Any]], names: Collection[str] = FACETS) -> Dict[str, Any]:
+    """Counts for each requested facet plus min/median/max price, in one pass."""
+    counts = FacetCounts(names)
+    counts.add_all(properties)
+    return counts.result()
+
+
+class FacetCounts:
+    """Running facet counts that listings can be added to and removed from.
+
+    Kept for the unfiltered catalog so a change-log batch costs O(changed
+    rows): the changed listings' old values are removed and the new ones
+    added. Prices are kept sorted, so min/median/max need no rescan.
+    """
+
+    def __init__(self, names: Collection[str] = FACETS) -> None:
+        self._city = "city" in names
+        self._bedrooms = "bedrooms" in names
+        self._price = "price" in names
+        self._amenities = "amenities" in names
+        self.cities: Counter = Counter()
+        self.bedrooms = [0] * len(BEDROOM_BUCKETS)
+        self.price_counts = [0] * len(PRICE_EDGES)
+        self.amenities: Counter = Counter()
+        self.prices: List[float] = []
+
+    def add_all(self, properties: Iterable[Dict[str, Any]]) -> None:
+        prices = self.prices
+        self.prices = []
+        for item in properties:
+            self._count(item, 1)
+        # One sort instead of an insort per listing
+        self.prices = sorted(prices + self.prices)
+
+    def add(self, item: Dict[str, Any]) -> None:
+        self._count(item, 1)
+
+    def remove(self, item: Dict[str, Any]) -> None:
+        self._count(item, -1)
+
+    def _count(self, item: Dict[str, Any], delta: int) -> None:
+        price = item.get("price")
+        if isinstance(price, (int, float)) and not isinstance(price, bool):
+            if delta > 0:
+                insort(self.prices, price)
+            else:
+                i = bisect_left(self.prices, price)
+                if i < len(self.prices) and self.prices[i] == price:
+                    self.prices.pop(i)
+            if self._price and price >= 0:
+                self.price_counts[bisect_right(PRICE_EDGES, price) - 1] += delta
+        if self._city:
+            city = str(item.get("location") or "").split(",")[0].strip()
+            if city:
+                _bump(self.cities, city, delta)
+        if self._bedrooms:
+            beds = item.get("bedrooms")
+            if isinstance(beds, (int, float)) and not isinstance(beds, bool) and beds >= 0:
+                self.bedrooms[min(int(beds), len(BEDROOM_BUCKETS) - 1)] += delta
+        if self._amenities:
+            for amenity in set(item.get("amenities") or ()):
+                _bump(self.amenities, amenity, delta)
+
+    def result(self) -> Dict[str, Any]:
+        facets: Dict[str, Any] = {}
+        if self._city:
+            facets["city"] = dict(self.cities.most_common())
+        if self._bedrooms:
+            facets["bedrooms"] = dict(zip(BEDROOM_BUCKETS, self.bedrooms))
+        if self._price:
+            upper = list(PRICE_EDGES[1:]) + [None]
+            facets["price"] = [
+                {"min": lo, "max": hi, "count": count} for lo, hi, count in zip(PRICE_EDGES, upper, self.price_counts)
+            ]
+        if self._amenities:
+            facets["amenities"] = dict(self.amenities.most_common())
+        prices = self.prices
+        facets["price_stats"] = {
+            "count": len(prices),
+            "min": prices[0] if prices else None,
+            "median": _sorted_median(prices),
+            "max": prices[-1] if prices else None,
+        }
+        return facets
+
+
+def _sorted_median(prices: List[float]) -> Optional[float]:
+    # Same value as statistics.median, without re-sorting an already sorted list
+    if not prices:
+        return None
+    mid = len(prices) // 2
+    return prices[mid] if len(prices) % 2 else (prices[mid - 1] + prices[mid]) / 2
+
+
+def _bump(counter: Counter, key: str, delta: int) -> None:
+    counter[key] += delta
+    if counter[key] <= 0:
+        del counter[key]
+
+
+def select_facets(facets: Dict[str, Any], names: Collection[str]) -> Dict[str, Any]:
+    """Subset of a full facet result (e.g. the cached unfiltered one)."""
+    return {name: value for name, value in facets.items() if name in names or name == "price_stats"}
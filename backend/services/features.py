@@ -0,0 +1,53 @@
+def map_features(prop: dict) -> dict:
+    title = str(prop.get("title", "")).lower()
+    amenities = [a.lower() for a in prop.get("amenities", [])]
+    size = prop.get("size") or prop.get("size_sqft") or 1800
+    property_type = "Condo" if "condo" in title or "apartment" in title else "SFH"
+    has_pool = any("pool" in a for a in amenities)
+    has_garage = any("garage" in a for a in amenities)
+    school_rating = _school_rating_from_location(prop.get("location", ""))
+    year_built = _year_from_price(prop.get("price"))
+
+    return {
+        "property_type": property_type,
+        "lot_area": int(size if property_type == "SFH" else 0),
+        "building_area": int(size if property_type == "Condo" else 0),
+        "bedrooms": int(prop.get("bedrooms") or 2),
+        "bathrooms": int(prop.get("bathrooms") or 1),
+        "year_built": year_built,
+        "has_pool": has_pool,
+        "has_garage": has_garage,
+        "school_rating": school_rating,
+    }
+
+
+def _school_rating_from_location(location: str) -> int:
+    city = location.lower()
+    table = {
+        "new york": 9,
+        "miami": 8,
+        "los angeles": 8,
+        "austin": 7,
+        "san francisco": 9,
+        "chicago": 7,
+        "dallas": 7,
+        "seattle": 9,
+        "boston": 9,
+    }
+    for key, rating in table.items():
+        if key in city:
+            return rating
+    return 7
+
+
+def _year_from_price(price) -> int:
+    try:
+        if price and price > 1000000:
+            return 2018
+        if price and price > 700000:
+            return 2015
+        if price and price > 400000:
+            return 2012
+        return 2008
+    except Exception:
+        return 2010
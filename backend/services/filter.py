@@ -15,31 +15,8 @@ def apply_filters(
     results = []
     for item in properties:
         # Handle location as string or array
-        if location:
-            item_location = item.get("location", "").lower()
-            # Extract city name from location (e.g., "New York, NY" -> "New York")
-            item_city = item_location.split(",")[0].strip()
-            
-            if isinstance(location, list):
-                # Check if item location matches any location in the array
-                # Match if the city name matches (handles "New York" matching "New York, NY")
-                # Also handle cases where location might be "New York City" matching "New York"
-                location_matches = any(
-                    loc_lower == item_city or 
-                    item_city.startswith(loc_lower) or
-                    loc_lower in item_city or
-                    item_city in loc_lower
-                    for loc in location
-                    for loc_lower in [loc.lower()]
-                )
-                if not location_matches:
-                    continue
-            else:
-                # Handle location as string (original behavior)
-                # Check if location string contains the city name
-                location_str = str(location).lower()
-                if location_str != item_city and not item_city.startswith(location_str) and location_str not in item_city and item_city not in location_str:
-                    continue
+        if location and not location_matches(item.get("location", ""), location):
+            continue
         price = item.get("price")
         if min_price is not None and (price is None or price < min_price):
             continue
@@ -61,9 +38,37 @@ def apply_filters(
         results.sort(key=lambda x: x.get("price") or 0, reverse=reverse)
     elif sort_by == "bedrooms":
         results.sort(key=lambda x: x.get("bedrooms") or 0, reverse=reverse)
+    elif sort_by == "distance":
+        # Listings without a distance (no coordinates) always go last
+        with_distance = [x for x in results if x.get("distance_km") is not None]
+        without_distance = [x for x in results if x.get("distance_km") is None]
+        with_distance.sort(key=lambda x: x["distance_km"], reverse=reverse)
+        results = with_distance + without_distance
     return results
 
 
+def location_matches(item_location: str, location: str | List[str]) -> bool:
+    # Extract city name from location (e.g., "New York, NY" -> "New York")
+    item_city = item_location.lower().split(",")[0].strip()
+
+    if isinstance(location, list):
+        # Check if item location matches any location in the array
+        # Match if the city name matches (handles "New York" matching "New York, NY")
+        # Also handle cases where location might be "New York City" matching "New York"
+        return any(
+            loc_lower == item_city or
+            item_city.startswith(loc_lower) or
+            loc_lower in item_city or
+            item_city in loc_lower
+            for loc in location
+            for loc_lower in [loc.lower()]
+        )
+    # Handle location as string (original behavior)
+    # Check if location string contains the city name
+    location_str = str(location).lower()
+    return location_str == item_city or item_city.startswith(location_str) or location_str in item_city or item_city in location_str
+
+
 def paginate(items: List[Dict[str, Any]], page: int, page_size: int) -> List[Dict[str, Any]]:
     start = (page - 1) * page_size
     end = start + page_size
@@ -0,0 +1,205 @@
+import math
+from typing import Any, Collection, Dict, Iterable, List, Optional, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+# Offline geocoding table for the cities that appear in the catalog. Keys are
+# lower-case city names, values are (lat, lon) of the city centre.
+CITY_COORDINATES: Dict[str, Tuple[float, float]] = {
+    "new york": (40.7128, -74.0060),
+    "miami": (25.7617, -80.1918),
+    "los angeles": (34.0522, -118.2437),
+    "austin": (30.2672, -97.7431),
+    "san francisco": (37.7749, -122.4194),
+    "chicago": (41.8781, -87.6298),
+    "dallas": (32.7767, -96.7970),
+    "seattle": (47.6062, -122.3321),
+    "boston": (42.3601, -71.0589),
+    "houston": (29.7604, -95.3698),
+    "denver": (39.7392, -104.9903),
+    "atlanta": (33.7490, -84.3880),
+    "phoenix": (33.4484, -112.0740),
+    "san diego": (32.7157, -117.1611),
+    "washington": (38.9072, -77.0369),
+}
+
+Point = Tuple[float, float]
+BoundingBox = Tuple[float, float, float, float]  # (min_lat, min_lon, max_lat, max_lon)
+
+
+def geocode(location: Optional[str]) -> Optional[Point]:
+    """Return (lat, lon) for a free-text location such as "Austin, TX"."""
+    if not location:
+        return None
+    text = str(location).lower()
+    city = text.split(",")[0].strip()
+    if city in CITY_COORDINATES:
+        return CITY_COORDINATES[city]
+    # Longest key first so "new york" wins over shorter accidental matches
+    for key in sorted(CITY_COORDINATES, key=len, reverse=True):
+        if key in text:
+            return CITY_COORDINATES[key]
+    return None
+
+
+def resolve_point(near: str) -> Optional[Point]:
+    """Parse a `near=` value: either "lat,lon" or a place name like "downtown Austin"."""
+    parts = [p.strip() for p in near.split(",")]
+    if len(parts) == 2:
+        try:
+            lat, lon = float(parts[0]), float(parts[1])
+        except ValueError:
+            pass
+        else:
+            if -90 <= lat <= 90 and -180 <= lon <= 180:
+                return lat, lon
+            return None
+    return geocode(near)
+
+
+def haversine_km(a: Point, b: Point) -> float:
+    lat1, lon1 = map(math.radians, a)
+    lat2, lon2 = map(math.radians, b)
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    h = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+class GridIndex:
+    """Uniform lat/lon grid mapping cells to catalog positions.
+
+    Radius and bounding-box queries only visit the cells that overlap the
+    search area, so cost scales with the number of nearby listings rather than
+    the catalog size.
+    """
+
+    def __init__(self, cell_degrees: float = 0.25) -> None:
+        self.cell_degrees = cell_degrees
+        # cell -> {position: (lat, lon, position)}; keyed by position so removal is O(1)
+        self._cells: Dict[Tuple[int, int], Dict[int, Tuple[float, float, int]]] = {}
+        self._size = 0
+
+    @classmethod
+    def build(cls, properties: Iterable[Dict[str, Any]], cell_degrees: float = 0.25) -> "GridIndex":
+        index = cls(cell_degrees)
+        for position, item in enumerate(properties):
+            lat, lon = item.get("lat"), item.get("lon")
+            if lat is not None and lon is not None:
+                index.add(float(lat), float(lon), position)
+        return index
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_degrees), math.floor(lon / self.cell_degrees)
+
+    def add(self, lat: float, lon: float, position: int) -> None:
+        bucket = self._cells.setdefault(self._cell(lat, lon), {})
+        if position not in bucket:
+            self._size += 1
+        bucket[position] = (lat, lon, position)
+
+    def remove(self, lat: float, lon: float, position: int) -> bool:
+        key = self._cell(lat, lon)
+        bucket = self._cells.get(key)
+        if not bucket or bucket.pop(position, None) is None:
+            return False
+        self._size -= 1
+        if not bucket:
+            del self._cells[key]
+        return True
+
+    def _scan(self, bbox: BoundingBox) -> Iterable[Tuple[float, float, int]]:
+        min_lat, min_lon, max_lat, max_lon = bbox
+        lat_lo, lon_lo = self._cell(min_lat, min_lon)
+        lat_hi, lon_hi = self._cell(max_lat, max_lon)
+        occupied = self._cell_keys()
+        if (lat_hi - lat_lo + 1) * (lon_hi - lon_lo + 1) > len(occupied):
+            # Area covers more cells than are populated; walk the occupied ones
+            keys: Iterable[Tuple[int, int]] = [
+                k for k in occupied if lat_lo <= k[0] <= lat_hi and lon_lo <= k[1] <= lon_hi
+            ]
+        else:
+            keys = ((i, j) for i in range(lat_lo, lat_hi + 1) for j in range(lon_lo, lon_hi + 1))
+        for key in keys:
+            for lat, lon, position in self._bucket(key):
+                if min_lat <= lat <= max_lat and min_lon <= lon <= max_lon:
+                    yield lat, lon, position
+
+    def _cell_keys(self) -> Collection[Tuple[int, int]]:
+        return self._cells.keys()
+
+    def _bucket(self, key: Tuple[int, int]) -> Iterable[Tuple[float, float, int]]:
+        bucket = self._cells.get(key)
+        return bucket.values() if bucket else ()
+
+    def all(self) -> Iterable[Tuple[float, float, int]]:
+        for key in self._cell_keys():
+            yield from self._bucket(key)
+
+    def within_bbox(self, bbox: BoundingBox) -> List[int]:
+        return [position for _, _, position in self._scan(bbox)]
+
+    def within_radius(self, center: Point, radius_km: float) -> List[Tuple[int, float]]:
+        """Return (position, distance_km) pairs for points within radius_km of center."""
+        lat, lon = center
+        dlat = radius_km / KM_PER_DEGREE_LAT
+        cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+        dlon = min(180.0, radius_km / (KM_PER_DEGREE_LAT * cos_lat))
+        bbox = (max(-90.0, lat - dlat), max(-180.0, lon - dlon), min(90.0, lat + dlat), min(180.0, lon + dlon))
+        hits = []
+        for p_lat, p_lon, position in self._scan(bbox):
+            distance = haversine_km(center, (p_lat, p_lon))
+            if distance <= radius_km:
+                hits.append((position, distance))
+        return hits
+
+
+def geo_search(
+    properties: List[Dict[str, Any]],
+    index: GridIndex,
+    center: Optional[Point] = None,
+    radius_km: Optional[float] = None,
+    bbox: Optional[BoundingBox] = None,
+) -> List[Dict[str, Any]]:
+    """Narrow the catalog to listings near `center` and/or inside `bbox`.
+
+    When a center is given, each returned listing is a shallow copy carrying a
+    `distance_km` key so results can be sorted by distance. With a center but
+    no radius or bbox, listings without coordinates are kept with
+    `distance_km=None`.
+    """
+    if center is not None and radius_km is not None:
+        hits = index.within_radius(center, radius_km)
+        if bbox is not None:
+            allowed = set(index.within_bbox(bbox))
+            hits = [(pos, dist) for pos, dist in hits if pos in allowed]
+    elif bbox is not None:
+        positions = index.within_bbox(bbox)
+        if center is None:
+            return [properties[pos] for pos in sorted(positions)]
+        hits = [(pos, _distance_to(properties[pos], center)) for pos in positions]
+    elif center is not None:
+        # No radius means "everything, ordered by distance": listings without
+        # coordinates are kept (distance_km=None) after the located ones
+        hits = [(pos, haversine_km(center, (lat, lon))) for lat, lon, pos in index.all()]
+        hits.sort()
+        located = [{**properties[pos], "distance_km": round(dist, 3)} for pos, dist in hits]
+        if len(located) == len(properties):
+            return located
+        indexed = {pos for pos, _ in hits}
+        return located + [
+            {**properties[pos], "distance_km": None} for pos in range(len(properties)) if pos not in indexed
+        ]
+    else:
+        return properties
+
+    hits.sort()
+    return [{**properties[pos], "distance_km": round(dist, 3)} for pos, dist in hits]
+
+
+def _distance_to(item: Dict[str, Any], center: Point) -> float:
+    return haversine_km(center, (float(item["lat"]), float(item["lon"])))
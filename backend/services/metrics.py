@@ -0,0 +1,154 @@
+"""In-process metrics with Prometheus text exposition.
+
+Kept dependency-free and cheap: recording a sample is a perf_counter delta,
+a bisect into fixed buckets and a few integer increments under a lock.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+# Bucket upper bounds in milliseconds
+DEFAULT_BUCKETS_MS: Tuple[float, ...] = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS_MS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._counters: Dict[Tuple[str, Labels], int] = {}
+        self._help: Dict[str, str] = {}
+
+    def describe(self, name: str, help_text: str) -> None:
+        self._help[name] = help_text
+
+    def observe(self, name: str, value_ms: float, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value_ms)
+
+    def inc(self, name: str, amount: int = 1, **labels: str) -> None:
+        self._inc_key((name, tuple(sorted(labels.items()))), amount)
+
+    def counter(self, name: str, **labels: str) -> Callable[..., None]:
+        """Pre-bind a counter's labels for call sites on a hot path."""
+        return partial(self._inc_key, (name, tuple(sorted(labels.items()))))
+
+    def _inc_key(self, key: Tuple[str, Labels], amount: int = 1) -> None:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def counter_value(self, name: str, **labels: str) -> int:
+        return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def histogram(self, name: str, **labels: str) -> Histogram | None:
+        return self._histograms.get((name, tuple(sorted(labels.items()))))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            histograms = {k: (list(h.counts), h.sum, h.count, h.buckets) for k, h in self._histograms.items()}
+            counters = dict(self._counters)
+
+        lines: List[str] = []
+        seen: set[str] = set()
+
+        def header(name: str, kind: str) -> None:
+            if name in seen:
+                return
+            seen.add(name)
+            if name in self._help:
+                lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), (counts, total, count, buckets) in sorted(histograms.items()):
+            header(name, "histogram")
+            cumulative = 0
+            for bound, bucket_count in zip(buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{name}_bucket{_fmt(labels + (('le', _num(bound)),))} {cumulative}")
+            lines.append(f"{name}_bucket{_fmt(labels + (('le', '+Inf'),))} {count}")
+            lines.append(f"{name}_sum{_fmt(labels)} {_num(total)}")
+            lines.append(f"{name}_count{_fmt(labels)} {count}")
+
+        for (name, labels), value in sorted(counters.items()):
+            header(name, "counter")
+            lines.append(f"{name}{_fmt(labels)} {value}")
+
+        # Derived hit ratio per cache so dashboards need no PromQL for the basics
+        caches: Dict[str, List[int]] = {}  # cache -> [hits, total]
+        for (name, labels), value in counters.items():
+            if name == "cache_requests_total":
+                label_map = dict(labels)
+                totals = caches.setdefault(label_map.get("cache", ""), [0, 0])
+                totals[0] += value if label_map.get("result") == "hit" else 0
+                totals[1] += value
+        if caches:
+            header("cache_hit_ratio", "gauge")
+            for cache, (hits, total_requests) in sorted(caches.items()):
+                ratio = hits / total_requests if total_requests else 0.0
+                lines.append(f"cache_hit_ratio{_fmt((('cache', cache),))} {_num(ratio)}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _num(value: float) -> str:
+    return f"{value:.6g}" if isinstance(value, float) else str(value)
+
+
+def _fmt(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics = MetricsRegistry()
+metrics.describe("http_request_duration_ms", "HTTP request latency by route template, in milliseconds.")
+metrics.describe("stage_duration_ms", "Latency of internal processing stages, in milliseconds.")
+metrics.describe("cache_requests_total", "Cache lookups by cache name and hit/miss result.")
+metrics.describe("llm_fallbacks_total", "NLP requests answered by the heuristic instead of the LLM.")
+metrics.describe("model_fallbacks_total", "Price predictions that fell back to the listed price.")
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Record the wall time of the enclosed block under `stage_duration_ms{stage=...}`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.observe("stage_duration_ms", (time.perf_counter() - start) * 1000, stage=stage)
+
+
+def record_cache(cache: str, hit: bool, amount: int = 1) -> None:
+    metrics.inc("cache_requests_total", amount=amount, cache=cache, result="hit" if hit else "miss")
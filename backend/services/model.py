@@ -1,13 +1,31 @@
 import pickle
+import threading
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 from backend.config import get_settings
+from backend.services.metrics import metrics, timed
+
+_count_model_missing = metrics.counter("model_fallbacks_total", reason="model_missing")
+_count_predict_error = metrics.counter("model_fallbacks_total", reason="predict_error")
 
 
 class PriceModel:
     def __init__(self) -> None:
-        self._model = self._load_model()
+        # Unpickling pulls in scikit-learn, so defer it to the first prediction
+        self._model: Any = None
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+    @property
+    def model(self) -> Any:
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    with timed("model_load"):
+                        self._model = self._load_model()
+                    self._loaded = True
+        return self._model
 
     def _load_model(self):
         settings = get_settings()
@@ -22,10 +40,13 @@ class PriceModel:
             return None
 
     def predict_price(self, features: Dict[str, Any], fallback_price: Optional[float] = None) -> float:
-        if self._model is None:
+        model = self.model
+        if model is None:
+            _count_model_missing()
             return fallback_price if fallback_price is not None else 0.0
         try:
-            pred = self._model.predict(features)
+            with timed("model_predict"):
+                pred = model.predict(features)
             # handle list/ndarray or scalar
             if isinstance(pred, (list, tuple)) and pred:
                 return float(pred[0])
@@ -34,8 +55,30 @@ class PriceModel:
                 return float(first)
             return float(pred)
         except Exception:
+            _count_predict_error()
             return fallback_price if fallback_price is not None else 0.0
 
+    def predict_prices(
+        self,
+        features: Sequence[Dict[str, Any]],
+        fallback_prices: Optional[Sequence[Optional[float]]] = None,
+    ) -> List[float]:
+        """Predict a batch in one model call, falling back to per-row prediction."""
+        fallbacks = list(fallback_prices) if fallback_prices is not None else [None] * len(features)
+        model = self.model
+        if model is None or not features:
+            if features:
+                _count_model_missing(len(features))
+            return [fb if fb is not None else 0.0 for fb in fallbacks]
+        try:
+            with timed("model_predict"):
+                preds = list(model.predict(list(features)))
+            if len(preds) == len(features):
+                return [float(p) for p in preds]
+        except Exception:
+            pass
+        return [self.predict_price(f, fallback_price=fb) for f, fb in zip(features, fallbacks)]
+
 
 price_model = PriceModel()
 
@@ -0,0 +1,207 @@
+"""Opt-in sampling profiler for slow requests.
+
+A fraction of requests to the configured paths is profiled, either with
+cProfile or with a background thread sampling the request thread's stack.
+Profiles of requests slower than the threshold are kept in a bounded ring
+and served by the admin routes as pstats or collapsed-stack output.
+
+Captures cover the whole event-loop thread while the request is in flight,
+so concurrently running requests can show up in a profile too.
+"""
+
+import cProfile
+import io
+import itertools
+import marshal
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from backend.config import Settings
+
+MODES = ("cprofile", "stack")
+
+
+@dataclass
+class CapturedProfile:
+    id: int
+    method: str
+    path: str
+    duration_ms: float
+    captured_at: str
+    mode: str
+    stats: Optional[pstats.Stats] = None
+    stacks: Counter = field(default_factory=Counter)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "duration_ms": round(self.duration_ms, 3),
+            "captured_at": self.captured_at,
+            "mode": self.mode,
+        }
+
+    def to_pstats_bytes(self) -> bytes:
+        """Same format as `pstats.Stats.dump_stats`, loadable with `pstats.Stats(path)`."""
+        if self.stats is None:
+            raise ValueError("pstats output is only available for cprofile captures")
+        return marshal.dumps(self.stats.stats)  # type: ignore[attr-defined]
+
+    def to_text(self, limit: int = 50) -> str:
+        if self.mode == "stack":
+            return self.to_collapsed()
+        out = io.StringIO()
+        self.stats.stream = out  # type: ignore[attr-defined]
+        self.stats.sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+    def to_collapsed(self) -> str:
+        """Brendan Gregg's collapsed format, ready for flamegraph.pl or speedscope."""
+        if self.mode != "stack":
+            raise ValueError("collapsed output is only available for stack captures")
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class _StackSampler:
+    """Samples one thread's Python stack at a fixed interval from a helper thread."""
+
+    def __init__(self, thread_id: int, interval_s: float) -> None:
+        self.thread_id = thread_id
+        self.interval_s = interval_s
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+
+class _ActiveCapture:
+    def __init__(self, mode: str, interval_s: float) -> None:
+        self.mode = mode
+        self.start = time.perf_counter()
+        self.profile: Optional[cProfile.Profile] = None
+        self.sampler: Optional[_StackSampler] = None
+        if mode == "cprofile":
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        else:
+            self.sampler = _StackSampler(threading.get_ident(), interval_s)
+            self.sampler.start()
+
+
+class RequestProfiler:
+    def __init__(
+        self,
+        enabled: bool = False,
+        mode: str = "cprofile",
+        sample_rate: float = 0.1,
+        threshold_ms: float = 500.0,
+        max_profiles: int = 20,
+        paths: Optional[List[str]] = None,
+        stack_interval_ms: float = 5.0,
+    ) -> None:
+        mode = mode.strip().lower()
+        # A disabled profiler never captures, so a bad mode must not stop the app starting
+        if enabled and mode not in MODES:
+            raise ValueError(f"profiling mode must be one of {MODES}, got {mode!r}")
+        self.enabled = enabled
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self.threshold_ms = threshold_ms
+        self.paths = set(paths or [])
+        self.stack_interval_s = stack_interval_ms / 1000
+        self._profiles: deque[CapturedProfile] = deque(maxlen=max_profiles)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        # cProfile can only have one active profiler per thread (and per
+        # process on 3.12+), so at most one request is profiled at a time.
+        self._busy = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "RequestProfiler":
+        return cls(
+            enabled=settings.profiling_enabled,
+            mode=settings.profiling_mode,
+            sample_rate=settings.profiling_sample_rate,
+            threshold_ms=settings.profiling_threshold_ms,
+            max_profiles=settings.profiling_max_profiles,
+            paths=settings.profiling_paths,
+        )
+
+    def start(self, path: str) -> Optional[_ActiveCapture]:
+        """Begin a capture if this request is sampled; returns None otherwise."""
+        if not self.enabled or path not in self.paths or random.random() >= self.sample_rate:
+            return None
+        if not self._busy.acquire(blocking=False):
+            return None
+        try:
+            return _ActiveCapture(self.mode, self.stack_interval_s)
+        except Exception:
+            self._busy.release()
+            return None
+
+    def finish(self, capture: _ActiveCapture, method: str, path: str) -> Optional[CapturedProfile]:
+        duration_ms = (time.perf_counter() - capture.start) * 1000
+        stacks: Counter = Counter()
+        try:
+            if capture.profile is not None:
+                capture.profile.disable()
+            if capture.sampler is not None:
+                stacks = capture.sampler.stop()
+        finally:
+            self._busy.release()
+
+        if duration_ms < self.threshold_ms:
+            return None
+        stats = pstats.Stats(capture.profile) if capture.profile is not None else None
+        captured = CapturedProfile(
+            id=next(self._ids),
+            method=method,
+            path=path,
+            duration_ms=duration_ms,
+            captured_at=datetime.now(timezone.utc).isoformat(),
+            mode=capture.mode,
+            stats=stats,
+            stacks=stacks,
+        )
+        with self._lock:
+            self._profiles.append(captured)
+        return captured
+
+    def profiles(self) -> List[CapturedProfile]:
+        with self._lock:
+            return list(self._profiles)
+
+    def get(self, profile_id: int) -> Optional[CapturedProfile]:
+        with self._lock:
+            return next((p for p in self._profiles if p.id == profile_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
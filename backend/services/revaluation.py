@@ -0,0 +1,207 @@
+"""Offline bulk revaluation of the whole catalog.
+
+Streams the property data files in chunks, scores each chunk with
+`map_features` + `PriceModel.predict_prices` across a process pool and writes
+one row per listing to CSV, JSONL or Parquet. Run via `python revalue.py`.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from backend.services.data_loader import PropertyDataLoader
+from backend.services.features import map_features
+
+OUTPUT_FIELDS = ["id", "location", "price", "predicted_price", "delta", "delta_pct"]
+
+_worker_model = None
+
+
+def _init_worker() -> None:
+    global _worker_model
+    from backend.services.model import PriceModel
+
+    _worker_model = PriceModel()
+
+
+def score_chunk(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Predict prices for one chunk; runs inside a pool worker (or in-process)."""
+    if _worker_model is None:
+        _init_worker()
+    features = [map_features(row) for row in rows]
+    predicted = _worker_model.predict_prices(features, [row.get("price") for row in rows])
+    scored = []
+    for row, price in zip(rows, predicted):
+        listed = row.get("price")
+        delta = price - listed if listed is not None else None
+        scored.append(
+            {
+                "id": row["id"],
+                "location": row.get("location"),
+                "price": listed,
+                "predicted_price": round(price, 2),
+                "delta": round(delta, 2) if delta is not None else None,
+                "delta_pct": round(delta / listed * 100, 3) if delta is not None and listed else None,
+            }
+        )
+    return scored
+
+
+class _JsonlWriter:
+    def __init__(self, path: Path) -> None:
+        self._f = path.open("w", encoding="utf-8")
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        self._f.writelines(json.dumps(row) + "\n" for row in rows)
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class _CsvWriter:
+    def __init__(self, path: Path) -> None:
+        self._f = path.open("w", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._f, fieldnames=OUTPUT_FIELDS)
+        self._writer.writeheader()
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path: Path) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise SystemExit("Parquet output requires pyarrow (pip install pyarrow)") from exc
+        self._pa = pa
+        self._schema = pa.schema(
+            [
+                ("id", pa.string()),
+                ("location", pa.string()),
+                ("price", pa.float64()),
+                ("predicted_price", pa.float64()),
+                ("delta", pa.float64()),
+                ("delta_pct", pa.float64()),
+            ]
+        )
+        self._writer = pq.ParquetWriter(str(path), self._schema)
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        columns = {name: [row[name] for row in rows] for name in OUTPUT_FIELDS}
+        self._writer.write_table(self._pa.Table.from_pydict(columns, schema=self._schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+WRITERS = {"jsonl": _JsonlWriter, "csv": _CsvWriter, "parquet": _ParquetWriter}
+
+
+def _format_for(path: Path, explicit: Optional[str]) -> str:
+    if explicit:
+        return explicit
+    suffix = path.suffix.lower().lstrip(".")
+    if suffix in ("pq", "parquet"):
+        return "parquet"
+    if suffix in WRITERS:
+        return suffix
+    return "jsonl"
+
+
+def _scored_chunks(chunks: Iterable[List[Dict[str, Any]]], workers: int) -> Iterator[List[Dict[str, Any]]]:
+    if workers <= 0:
+        for chunk in chunks:
+            yield score_chunk(chunk)
+        return
+
+    # Bound in-flight chunks so memory stays flat however big the catalog is
+    max_pending = workers * 2
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending: List[Future] = []
+        for chunk in chunks:
+            pending.append(pool.submit(score_chunk, chunk))
+            if len(pending) >= max_pending:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def revalue(
+    output: Path,
+    data_dir: Optional[str] = None,
+    fmt: Optional[str] = None,
+    workers: int = 0,
+    chunk_size: int = 5000,
+    progress: Optional[TextIO] = sys.stderr,
+) -> Dict[str, Any]:
+    """Score the whole catalog into `output`; returns a summary with throughput."""
+    fmt = _format_for(output, fmt)
+    loader = PropertyDataLoader(data_dir)
+    writer = WRITERS[fmt](output)
+    started = time.perf_counter()
+    rows = 0
+    chunks = 0
+    try:
+        for scored in _scored_chunks(loader.iter_chunks(chunk_size), workers):
+            writer.write(scored)
+            rows += len(scored)
+            chunks += 1
+            if progress is not None:
+                elapsed = time.perf_counter() - started
+                progress.write(f"\r{rows} listings scored ({rows / elapsed if elapsed else 0:.0f}/s)")
+                progress.flush()
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    summary = {
+        "output": str(output),
+        "format": fmt,
+        "rows": rows,
+        "chunks": chunks,
+        "workers": workers,
+        "elapsed_s": round(elapsed, 3),
+        "rows_per_s": round(rows / elapsed, 1) if elapsed else None,
+    }
+    if progress is not None:
+        progress.write("\n")
+        progress.flush()
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Score every listing with the price model.")
+    parser.add_argument("output", type=Path, help="Output file (.jsonl, .csv or .parquet)")
+    parser.add_argument("--format", choices=sorted(WRITERS), help="Override format inferred from extension")
+    parser.add_argument("--data-dir", help="Directory with the property_*.json files (default: DATA_DIR)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Process pool size; 0 scores in-process (default: CPU count)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--quiet", action="store_true", help="Suppress progress output")
+    args = parser.parse_args(argv)
+
+    summary = revalue(
+        args.output,
+        data_dir=args.data_dir,
+        fmt=args.format,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        progress=None if args.quiet else sys.stderr,
+    )
+    print(json.dumps(summary))
+    return 0
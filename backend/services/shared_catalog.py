@@ -0,0 +1,524 @@
+"""Catalog snapshots shared between worker processes through an mmap'd file.
+
+A publisher (``python serve.py`` or ``python -m backend.services.shared_catalog
+publish``) merges the data files once and writes a snapshot containing:
+
+- numeric columns (price, bedrooms, bathrooms, size, lat, lon) as float64,
+- a location code per row plus the table of distinct locations,
+- amenity postings (positions listing each amenity),
+- every row as compact JSON with an offsets array,
+- a sorted id index for O(log n) lookups by id,
+- the geo grid index (positions grouped by cell).
+
+Workers map the file read-only, so the OS page cache holds a single copy no
+matter how many workers attach. Columns and indexes are read in place through
+memoryviews; rows are decoded on access.
+
+Snapshots are immutable. Publishing writes ``catalog-<generation>.bin`` and then
+atomically replaces the ``CURRENT`` pointer file, and workers re-attach when
+they notice a new generation, so a swap is never observed half-written. Older
+generations are kept for a grace period so in-flight readers stay valid.
+Arrays use native byte order: snapshots are meant for the machine that wrote them.
+"""
+
+import argparse
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any, Collection, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from backend.services.facets import BEDROOM_BUCKETS, FACETS, PRICE_EDGES, FacetCounts, compute_facets
+from backend.services.filter import location_matches
+from backend.services.geo import GridIndex
+
+MAGIC = b"PCATSNP1"
+CURRENT_FILE = "CURRENT"
+NUMERIC_COLUMNS = ("price", "bedrooms", "bathrooms", "size", "lat", "lon")
+# Precomputed row orders matching apply_filters' sort_by options (missing -> 0)
+SORT_COLUMNS = ("price", "bedrooms")
+KEEP_GENERATIONS = 3
+
+
+def _align8(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def _column_value(row: Dict[str, Any], name: str) -> float:
+    value = (row.get("size") or row.get("size_sqft")) if name == "size" else row.get(name)
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else math.nan
+
+
+def write_snapshot(
+    properties: Sequence[Dict[str, Any]], path: Path, generation: int, cell_degrees: float = 0.25
+) -> None:
+    n = len(properties)
+    sections: Dict[str, Tuple[str, bytes]] = {}
+
+    for name in NUMERIC_COLUMNS:
+        values = array("d", (_column_value(p, name) for p in properties))
+        sections[f"col:{name}"] = ("d", values.tobytes())
+        if name in SORT_COLUMNS:
+            keys = [0.0 if v != v else v for v in values]
+            # Both directions, since a stable descending sort is not the reverse of the ascending one
+            for order in ("asc", "desc"):
+                positions = sorted(range(n), key=keys.__getitem__, reverse=order == "desc")
+                sections[f"order:{name}:{order}"] = ("q", array("q", positions).tobytes())
+
+    locations: List[str] = []
+    location_codes: Dict[str, int] = {}
+    codes = array("i")
+    for p in properties:
+        loc = str(p.get("location") or "")
+        code = location_codes.get(loc)
+        if code is None:
+            code = location_codes[loc] = len(locations)
+            locations.append(loc)
+        codes.append(code)
+    sections["location_code"] = ("i", codes.tobytes())
+
+    # Amenity postings keyed by the listed spelling, as facets count them;
+    # searches fold case across spellings like apply_filters does
+    postings: Dict[str, List[int]] = {}
+    for position, p in enumerate(properties):
+        for amenity in set(p.get("amenities") or ()):
+            postings.setdefault(amenity, []).append(position)
+    amenities = sorted(postings)
+    amenity_starts, amenity_positions = array("q", [0]), array("q")
+    for amenity in amenities:
+        amenity_positions.extend(postings[amenity])
+        amenity_starts.append(len(amenity_positions))
+    sections["amenity_starts"] = ("q", amenity_starts.tobytes())
+    sections["amenity_positions"] = ("q", amenity_positions.tobytes())
+
+    row_offsets = array("q", [0])
+    blobs = []
+    for p in properties:
+        encoded = json.dumps(p, separators=(",", ":")).encode("utf-8")
+        blobs.append(encoded)
+        row_offsets.append(row_offsets[-1] + len(encoded))
+    sections["row_offsets"] = ("q", row_offsets.tobytes())
+    sections["rows"] = ("B", b"".join(blobs))
+
+    order = sorted(range(n), key=lambda i: str(properties[i]["id"]))
+    id_offsets = array("q", [0])
+    id_blobs = []
+    for i in order:
+        encoded = str(properties[i]["id"]).encode("utf-8")
+        id_blobs.append(encoded)
+        id_offsets.append(id_offsets[-1] + len(encoded))
+    sections["id_offsets"] = ("q", id_offsets.tobytes())
+    sections["ids"] = ("B", b"".join(id_blobs))
+    sections["id_positions"] = ("q", array("q", order).tobytes())
+
+    grid = GridIndex.build(properties, cell_degrees)
+    cell_keys, cell_starts, cell_positions = array("q"), array("q", [0]), array("q")
+    for key in sorted(grid._cell_keys()):
+        cell_keys.extend(key)
+        cell_positions.extend(position for _, _, position in grid._bucket(key))
+        cell_starts.append(len(cell_positions))
+    sections["cell_keys"] = ("q", cell_keys.tobytes())
+    sections["cell_starts"] = ("q", cell_starts.tobytes())
+    sections["cell_positions"] = ("q", cell_positions.tobytes())
+
+    layout: Dict[str, Dict[str, Any]] = {}
+    offset = 0
+    for name, (typecode, data) in sections.items():
+        layout[name] = {"offset": offset, "length": len(data), "typecode": typecode}
+        offset = _align8(offset + len(data))
+    header = json.dumps(
+        {
+            "generation": generation,
+            "count": n,
+            "created_at": time.time(),
+            "cell_degrees": cell_degrees,
+            "locations": locations,
+            "amenities": amenities,
+            # Unfiltered facet counts, so workers never recompute them
+            "facets": compute_facets(properties),
+            "sections": layout,
+        }
+    ).encode("utf-8")
+
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        f.write(b"\0" * (_align8(16 + len(header)) - 16 - len(header)))
+        for name, (_, data) in sections.items():
+            f.write(data)
+            f.write(b"\0" * (_align8(len(data)) - len(data)))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def read_generation(directory: Path) -> Optional[int]:
+    try:
+        return int((Path(directory) / CURRENT_FILE).read_text().strip())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def snapshot_path(directory: Path, generation: int) -> Path:
+    return Path(directory) / f"catalog-{generation}.bin"
+
+
+def publish_snapshot(
+    properties: Sequence[Dict[str, Any]], directory: Path, keep: int = KEEP_GENERATIONS
+) -> int:
+    """Write a new snapshot generation and atomically point CURRENT at it."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    generation = (read_generation(directory) or 0) + 1
+    write_snapshot(properties, snapshot_path(directory, generation), generation)
+
+    pointer_tmp = directory / f"{CURRENT_FILE}.tmp"
+    pointer_tmp.write_text(str(generation))
+    os.replace(pointer_tmp, directory / CURRENT_FILE)
+
+    # Unlinking a mapped file is safe on POSIX; workers still on an old
+    # generation keep reading it until they re-attach.
+    for old in directory.glob("catalog-*.bin"):
+        try:
+            old_generation = int(old.stem.split("-", 1)[1])
+        except ValueError:
+            continue
+        if old_generation <= generation - keep:
+            old.unlink(missing_ok=True)
+    return generation
+
+
+class SharedCatalog(Sequence):
+    """Read-only, zero-copy view of one snapshot generation."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        if view[:8] != MAGIC:
+            raise ValueError(f"{path} is not a catalog snapshot")
+        (header_len,) = struct.unpack_from("<Q", view, 8)
+        header = json.loads(bytes(view[16 : 16 + header_len]))
+        base = _align8(16 + header_len)
+
+        self.generation: int = header["generation"]
+        self.cell_degrees: float = header["cell_degrees"]
+        self.locations: List[str] = header["locations"]
+        self.facets: Dict[str, Any] = header["facets"]
+        self.amenities: List[str] = header["amenities"]
+        self._amenity_ids: Dict[str, List[int]] = {}
+        for i, name in enumerate(self.amenities):
+            self._amenity_ids.setdefault(name.lower(), []).append(i)
+        self._count: int = header["count"]
+        self._sections: Dict[str, memoryview] = {}
+        for name, spec in header["sections"].items():
+            raw = view[base + spec["offset"] : base + spec["offset"] + spec["length"]]
+            self._sections[name] = raw if spec["typecode"] == "B" else raw.cast(spec["typecode"])
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):  # type: ignore[override]
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("catalog index out of range")
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self._count):
+            yield self._row(i)
+
+    def _row(self, position: int) -> Dict[str, Any]:
+        offsets = self._sections["row_offsets"]
+        return json.loads(bytes(self._sections["rows"][offsets[position] : offsets[position + 1]]))
+
+    def column(self, name: str) -> memoryview:
+        return self._sections[f"col:{name}"]
+
+    @property
+    def location_codes(self) -> memoryview:
+        return self._sections["location_code"]
+
+    def position_of(self, property_id: str) -> Optional[int]:
+        offsets, ids = self._sections["id_offsets"], self._sections["ids"]
+        target = str(property_id)
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            current = bytes(ids[offsets[mid] : offsets[mid + 1]]).decode("utf-8")
+            if current < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and bytes(ids[offsets[lo] : offsets[lo + 1]]).decode("utf-8") == target:
+            return self._sections["id_positions"][lo]
+        return None
+
+    def by_id(self) -> "SharedIdMap":
+        return SharedIdMap(self)
+
+    def geo_index(self) -> "SharedGridIndex":
+        return SharedGridIndex(self)
+
+    def search(
+        self,
+        location: Optional[str | List[str]] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        min_bedrooms: Optional[int] = None,
+        min_bathrooms: Optional[int] = None,
+        amenities: Optional[List[str]] = None,
+        sort_by: str = "price",
+        sort_order: str = "asc",
+    ) -> "SharedRows":
+        """Filter and sort on the numeric columns; rows are decoded only when read.
+
+        Same result and order as `apply_filters` with these arguments: a
+        missing price fails price bounds, missing bedrooms/bathrooms count as 0.
+        Amenities use the snapshot's postings index.
+        """
+        # Like apply_filters: anything but "desc" sorts ascending, other sort_by values keep catalog order
+        direction = "desc" if sort_order == "desc" else "asc"
+        order = self._sections.get(f"order:{sort_by}:{direction}")
+        positions: Sequence[int] = order if order is not None else range(self._count)
+
+        if location:
+            allowed = {code for code, loc in enumerate(self.locations) if location_matches(loc, location)}
+            codes = self.location_codes
+            positions = [i for i in positions if codes[i] in allowed] if allowed else []
+        if min_price is not None:
+            price = self.column("price")
+            positions = [i for i in positions if price[i] >= min_price]  # NaN fails
+        if max_price is not None:
+            price = self.column("price")
+            positions = [i for i in positions if price[i] <= max_price]
+        if min_bedrooms is not None:
+            bedrooms = self.column("bedrooms")
+            positions = [i for i in positions if _or_zero(bedrooms[i]) >= min_bedrooms]
+        if min_bathrooms is not None:
+            bathrooms = self.column("bathrooms")
+            positions = [i for i in positions if _or_zero(bathrooms[i]) >= min_bathrooms]
+
+        if amenities:
+            allowed_positions = self._with_amenities(amenities)
+            positions = [i for i in positions if i in allowed_positions]
+        return SharedRows(self, positions)
+
+    def _with_amenities(self, amenities: List[str]) -> set:
+        """Positions listing every one of `amenities` (case-insensitive)."""
+        starts, postings = self._sections["amenity_starts"], self._sections["amenity_positions"]
+        lists = []
+        for name in set(map(str.lower, amenities)):
+            amenity_ids = self._amenity_ids.get(name)
+            if amenity_ids is None:
+                return set()
+            matching = set()
+            for amenity_id in amenity_ids:
+                matching.update(postings[starts[amenity_id] : starts[amenity_id + 1]])
+            lists.append(matching)
+        lists.sort(key=len)
+        allowed = lists[0]
+        for other in lists[1:]:
+            allowed.intersection_update(other)
+        return allowed
+
+    def facets_at(self, positions: Sequence[int], names: Collection[str] = FACETS) -> Dict[str, Any]:
+        """`compute_facets` over the rows at `positions`, from columns and postings without decoding rows."""
+        counts = FacetCounts(names)
+        price = self.column("price")
+        prices = [price[i] for i in positions if price[i] == price[i]]
+        # JSON ints come back from the float64 column as floats; render them as the rows hold them
+        counts.prices = sorted(int(v) if v.is_integer() else v for v in prices)
+        if "price" in names:
+            for value in counts.prices:
+                if value >= 0:
+                    counts.price_counts[bisect_right(PRICE_EDGES, value) - 1] += 1
+        if "bedrooms" in names:
+            bedrooms = self.column("bedrooms")
+            last = len(BEDROOM_BUCKETS) - 1
+            for i in positions:
+                beds = bedrooms[i]
+                if beds >= 0:  # NaN fails
+                    counts.bedrooms[min(int(beds), last)] += 1
+        if "city" in names:
+            codes = self.location_codes
+            per_code = Counter(codes[i] for i in positions)
+            for code, count in per_code.items():
+                city = self.locations[code].split(",")[0].strip()
+                if city:
+                    counts.cities[city] += count
+        if "amenities" in names:
+            starts, postings = self._sections["amenity_starts"], self._sections["amenity_positions"]
+            selected = positions if isinstance(positions, (set, range)) else set(positions)
+            for amenity_id, amenity in enumerate(self.amenities):
+                count = sum(1 for i in postings[starts[amenity_id] : starts[amenity_id + 1]] if i in selected)
+                if count:
+                    counts.amenities[amenity] = count
+        return counts.result()
+
+
+def _or_zero(value: float) -> float:
+    return 0.0 if value != value else value
+
+
+class SharedRows(Sequence):
+    """Rows of a catalog at the given positions, decoded on access."""
+
+    def __init__(self, catalog: SharedCatalog, positions: Sequence[int]) -> None:
+        self._catalog = catalog
+        self.positions = positions
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __getitem__(self, index):  # type: ignore[override]
+        if isinstance(index, slice):
+            return [self._catalog._row(i) for i in self.positions[index]]
+        return self._catalog._row(self.positions[index])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in self.positions:
+            yield self._catalog._row(i)
+
+    def facets(self, names: Collection[str] = FACETS) -> Dict[str, Any]:
+        return self._catalog.facets_at(self.positions, names)
+
+
+class SharedIdMap(Mapping):
+    """`{id: row}` view backed by the snapshot's sorted id index."""
+
+    def __init__(self, catalog: SharedCatalog) -> None:
+        self._catalog = catalog
+
+    def __getitem__(self, property_id: str) -> Dict[str, Any]:
+        position = self._catalog.position_of(property_id)
+        if position is None:
+            raise KeyError(property_id)
+        return self._catalog[position]
+
+    def __contains__(self, property_id: object) -> bool:
+        return self._catalog.position_of(str(property_id)) is not None
+
+    def __len__(self) -> int:
+        return len(self._catalog)
+
+    def __iter__(self) -> Iterator[str]:
+        offsets, ids = self._catalog._sections["id_offsets"], self._catalog._sections["ids"]
+        for i in range(len(self._catalog)):
+            yield bytes(ids[offsets[i] : offsets[i + 1]]).decode("utf-8")
+
+
+class SharedGridIndex(GridIndex):
+    """Read-only GridIndex over the cell arrays stored in a snapshot."""
+
+    def __init__(self, catalog: SharedCatalog) -> None:
+        super().__init__(catalog.cell_degrees)
+        keys = catalog._sections["cell_keys"]
+        starts = catalog._sections["cell_starts"]
+        # Only the (small) cell -> range table is materialised per worker
+        self._ranges = {(keys[2 * i], keys[2 * i + 1]): (starts[i], starts[i + 1]) for i in range(len(starts) - 1)}
+        self._positions = catalog._sections["cell_positions"]
+        self._lat = catalog.column("lat")
+        self._lon = catalog.column("lon")
+        self._size = len(self._positions)
+
+    def _cell_keys(self):
+        return self._ranges.keys()
+
+    def _bucket(self, key: Tuple[int, int]) -> Iterable[Tuple[float, float, int]]:
+        start, end = self._ranges.get(key, (0, 0))
+        for i in range(start, end):
+            position = self._positions[i]
+            yield self._lat[position], self._lon[position], position
+
+    def add(self, lat: float, lon: float, position: int) -> None:
+        raise TypeError("shared geo index is read-only")
+
+    def remove(self, lat: float, lon: float, position: int) -> bool:
+        raise TypeError("shared geo index is read-only")
+
+
+class SharedCatalogReader:
+    """Tracks the CURRENT generation in a snapshot directory and re-attaches on swaps."""
+
+    def __init__(self, directory: Path, check_interval_s: float = 1.0) -> None:
+        self.directory = Path(directory)
+        self.check_interval_s = check_interval_s
+        self._catalog: Optional[SharedCatalog] = None
+        self._checked_at = float("-inf")
+
+    def recheck(self) -> None:
+        """Look at CURRENT on the next `current()` call regardless of the interval."""
+        self._checked_at = float("-inf")
+
+    def current(self) -> SharedCatalog:
+        now = time.monotonic()
+        if self._catalog is not None and now - self._checked_at < self.check_interval_s:
+            return self._catalog
+        self._checked_at = now
+        generation = read_generation(self.directory)
+        if generation is None:
+            if self._catalog is None:
+                raise FileNotFoundError(f"No catalog snapshot published in {self.directory}")
+            return self._catalog
+        if self._catalog is None or self._catalog.generation != generation:
+            # The previous mapping is released once no request references it
+            self._catalog = SharedCatalog(snapshot_path(self.directory, generation))
+        return self._catalog
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from backend.config import get_settings
+    from backend.services.data_loader import PropertyDataLoader
+
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Manage shared catalog snapshots.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    publish = sub.add_parser("publish", help="Build a snapshot from the data files and make it current")
+    publish.add_argument("--data-dir", default=settings.data_dir)
+    publish.add_argument("--snapshot-dir", default=settings.catalog_snapshot_dir)
+    show = sub.add_parser("show", help="Describe the current snapshot")
+    show.add_argument("--snapshot-dir", default=settings.catalog_snapshot_dir)
+    args = parser.parse_args(argv)
+
+    if args.command == "publish":
+        start = time.perf_counter()
+        properties = PropertyDataLoader(args.data_dir).load()
+        generation = publish_snapshot(properties, Path(args.snapshot_dir))
+        print(
+            json.dumps(
+                {
+                    "generation": generation,
+                    "rows": len(properties),
+                    "path": str(snapshot_path(Path(args.snapshot_dir), generation)),
+                    "elapsed_s": round(time.perf_counter() - start, 3),
+                }
+            )
+        )
+        return 0
+
+    generation = read_generation(Path(args.snapshot_dir))
+    if generation is None:
+        print(f"No snapshot in {args.snapshot_dir}", file=sys.stderr)
+        return 1
+    catalog = SharedCatalog(snapshot_path(Path(args.snapshot_dir), generation))
+    print(json.dumps({"generation": generation, "rows": len(catalog), "bytes": catalog.path.stat().st_size}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -71,3 +71,65 @@ def test_compare_predict(client: TestClient):
     data = resp.json()
     assert "properties" in data and len(data["properties"]) == 2
 
+
+
+def test_search_near_with_radius(client: TestClient):
+    resp = client.get(
+        "/properties/search", params={"near": "downtown Austin", "radius_km": 50, "sort_by": "distance"}
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["total"] >= 1
+    assert all("Austin" in item["location"] for item in data["results"])
+    assert data["results"][0]["distance_km"] is not None
+
+    bad = client.get("/properties/search", params={"near": "Atlantis"})
+    assert bad.status_code == 400
+
+
+def test_search_with_facets(client: TestClient):
+    resp = client.get("/properties/search", params={"facets": "all", "page_size": 1})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert sum(data["facets"]["city"].values()) == data["total"]
+    assert data["facets"]["price_stats"]["min"] <= data["facets"]["price_stats"]["median"]
+
+    filtered = client.get("/properties/search", params={"location": "New York", "facets": "city,bedrooms"}).json()
+    assert filtered["facets"]["city"] == {"New York": filtered["total"]}
+    assert "amenities" not in filtered["facets"]
+    assert client.get("/properties/search").json()["facets"] is None
+    assert client.get("/properties/search", params={"facets": "colour"}).status_code == 400
+
+
+def test_compare_batch(client: TestClient):
+    resp = client.post(
+        "/compare/batch",
+        json={"property_ids": ["1", "2", "3", "missing"], "addresses": ["Seattle, WA", "Atlantis"]},
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    ids = [item["id"] for item in data["properties"]]
+    assert ids == ["1", "2", "3", "9"]
+    assert data["unresolved"] == ["missing", "Atlantis"]
+    ranks = sorted(item["ranks"]["predicted_price"] for item in data["properties"])
+    assert ranks == [1, 2, 3, 4]
+    assert all("bedrooms" in item["feature_deltas"] for item in data["properties"])
+    too_long = client.post("/compare/batch", json={"addresses": ["x" * 201]})
+    assert too_long.status_code == 422
+
+
+def test_metrics_endpoint_reports_routes_and_stages(client: TestClient, monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    client.get("/properties/search", params={"location": "Austin"})
+    client.get("/properties/search", params={"location": "Austin"})
+    client.post("/nlp/parse", json={"text": "2 bed in Austin"})
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+    assert 'http_request_duration_ms_count{method="GET",route="/properties/search",status="2xx"}' in body
+    assert 'stage_duration_ms_bucket{stage="filter",le="+Inf"}' in body
+    assert 'stage_duration_ms_count{stage="serialize"}' in body
+    assert 'cache_hit_ratio{cache="catalog"}' in body
+    assert "llm_fallbacks_total{reason=" in body
@@ -0,0 +1,43 @@
+import json
+
+from backend.benchmarks.run import check_regressions, model_state_warnings, run_suite
+from backend.benchmarks.synthetic import generate_catalog
+from backend.services.data_loader import PropertyDataLoader
+
+
+def test_generate_catalog_matches_loader_format(tmp_path):
+    generate_catalog(tmp_path, 25)
+    properties = PropertyDataLoader(str(tmp_path)).load()
+    assert len(properties) == 25
+    assert {"id", "title", "price", "location", "bedrooms", "amenities", "images", "lat"} <= properties[0].keys()
+    json.loads((tmp_path / "property_images.json").read_text())
+
+
+def test_run_suite_reports_every_benchmark(tmp_path):
+    report = run_suite([50], repeat=1, workdir=tmp_path)
+    names = {r["name"] for r in report["results"]}
+    assert {"loader.load", "apply_filters.combined", "_heuristic_fallback", "GET /properties/search"} <= names
+    assert all(r["median_ms"] >= 0 for r in report["results"])
+
+
+def test_check_regressions_uses_thresholds_and_baseline():
+    results = [{"name": "a", "size": 10, "median_ms": 5.0}, {"name": "b", "size": 10, "median_ms": 5.0}]
+    regressions = check_regressions(
+        results,
+        thresholds={"a": {"10": 4.0}},
+        baseline=[{"name": "b", "size": 10, "median_ms": 2.0}],
+        tolerance=0.5,
+    )
+    assert [(r["name"], r["reason"]) for r in regressions] == [("a", "threshold"), ("b", "baseline")]
+
+
+def test_model_thresholds_follow_model_state():
+    results = [{"name": "predict_prices.batch1000", "size": 10, "median_ms": 50.0}]
+    thresholds = {"by_model_state": {"missing": {"predict_prices.batch1000": {"10": 5.0}}, "loaded": {}}}
+    assert [r["reason"] for r in check_regressions(results, thresholds, model_loaded=False)] == ["threshold"]
+    assert check_regressions(results, thresholds, model_loaded=True) == []
+
+    baseline = [{"name": "predict_prices.batch1000", "size": 10, "median_ms": 1.0}]
+    assert check_regressions(results, {}, baseline, model_loaded=True, baseline_model_loaded=False) == []
+    assert check_regressions(results, {}, baseline, model_loaded=True, baseline_model_loaded=True)
+    assert model_state_warnings(thresholds, model_loaded=True)
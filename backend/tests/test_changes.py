@@ -0,0 +1,176 @@
+import json
+import shutil
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app import create_app
+from backend.config import get_settings
+from backend.routes import compare, properties
+from backend.services.changes import append_changes, changes_path, read_changes
+from backend.services.data_loader import PropertyDataLoader
+from backend.services.geo import geo_search
+
+
+@pytest.fixture()
+def data_dir(tmp_path):
+    for name in ("property_basics.json", "property_characteristics.json", "property_images.json"):
+        shutil.copy(f"backend/data/{name}", tmp_path / name)
+    return tmp_path
+
+
+@pytest.fixture()
+def admin_token(monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    get_settings.cache_clear()
+    yield "secret"
+    get_settings.cache_clear()
+
+
+def _near_ids(loader, center):
+    return sorted(p["id"] for p in geo_search(loader.load(), loader.geo_index(), center=center, radius_km=100))
+
+
+def test_deltas_match_a_full_reload(data_dir):
+    loader = PropertyDataLoader(str(data_dir))
+    loader.load()
+    loader.by_id()
+    loader.geo_index()
+    version = loader.version
+
+    append_changes(data_dir, [
+        {"op": "upsert", "id": "4", "fields": {"price": 265000}},
+        {"op": "upsert", "id": "3", "fields": {"location": "Austin, TX"}},
+        {"op": "upsert", "id": "new-1", "fields": {"title": "Loft", "price": 500000, "location": "Austin, TX"}},
+        {"op": "delete", "id": "1"},
+    ])
+    catalog = loader.load()
+    assert loader.version == version and loader.revision == 1
+    assert loader.changed_since(0) == {"1", "3", "4", "new-1"}
+    assert loader.changed_since(1) == set()
+
+    fresh = PropertyDataLoader(str(data_dir))
+    assert sorted(catalog, key=lambda p: p["id"]) == sorted(fresh.load(), key=lambda p: p["id"])
+    assert loader.by_id()["4"]["price"] == 265000 and "1" not in loader.by_id()
+    assert _near_ids(loader, (30.2672, -97.7431)) == _near_ids(fresh, (30.2672, -97.7431)) == ["3", "4", "new-1"]
+    assert _near_ids(loader, (40.7128, -74.0060)) == ["6"]
+
+
+def test_facets_and_address_index_are_patched_not_rebuilt(data_dir):
+    loader = PropertyDataLoader(str(data_dir))
+    loader.load()
+    loader.facets()
+    index = loader.address_index()
+
+    append_changes(data_dir, [
+        {"op": "upsert", "id": "4", "fields": {"price": 2500000, "bedrooms": 7}},
+        {"op": "upsert", "id": "3", "fields": {"location": "Austin, TX", "title": "A much longer listing title than any other"}},
+        {"op": "upsert", "id": "new-1", "fields": {"title": "Loft", "price": 500000, "location": "Austin, TX", "amenities": ["Sauna"]}},
+        {"op": "delete", "id": "1"},
+    ])
+    loader.load()
+    assert loader._facet_counts is not None and loader.address_index().by_title is index.by_title
+
+    fresh = PropertyDataLoader(str(data_dir))
+    assert loader.facets() == fresh.facets()
+    assert loader.address_index() == fresh.address_index()
+
+
+def test_price_only_upserts_leave_the_geo_index_alone(data_dir, monkeypatch):
+    loader = PropertyDataLoader(str(data_dir))
+    loader.load()
+    index = loader.geo_index()
+    calls = []
+    monkeypatch.setattr(index, "remove", lambda *args: calls.append(args))
+    loader.apply_changes([{"op": "upsert", "id": str(i), "fields": {"price": 1000 * i}} for i in range(1, 11)])
+    assert calls == []
+    assert loader.by_id()["3"]["price"] == 3000
+
+
+def test_read_changes_applies_only_complete_batches(data_dir):
+    path = changes_path(data_dir)
+    append_changes(data_dir, [{"op": "delete", "id": "1"}, {"op": "delete", "id": "2"}])
+    with path.open("a") as f:
+        f.write('not json\n{"changes":[{"op":"delete","id":"3"},{"op":"explode","id":"4"}]}\n')
+        f.write('{"changes":[{"op":"delete","id":"6"},{"op":"del')  # batch still being written
+    changes, offset = read_changes(path)
+    assert [c["id"] for c in changes] == ["1", "2"]
+    assert read_changes(path, offset) == ([], offset)
+
+    loader = PropertyDataLoader(str(data_dir))
+    assert {"1", "2"}.isdisjoint(loader.by_id()) and "6" in loader.by_id()
+    with path.open("a") as f:
+        f.write('ete","id":"7"}]}\n')
+    assert {"6", "7"}.isdisjoint(loader.by_id())
+
+
+def test_truncated_log_triggers_full_reload(data_dir):
+    loader = PropertyDataLoader(str(data_dir))
+    append_changes(data_dir, [{"op": "delete", "id": "1"}])
+    assert len(loader.load()) == 9
+    changes_path(data_dir).write_text("")
+    assert len(loader.load()) == 10
+    assert loader.version == 2
+
+
+def test_ingest_api_updates_search_and_predictions(data_dir, admin_token, monkeypatch):
+    monkeypatch.setattr(properties, "data_loader", PropertyDataLoader(str(data_dir)))
+    monkeypatch.setattr(compare, "data_loader", PropertyDataLoader(str(data_dir)))
+    client = TestClient(create_app(), headers={"X-Admin-Token": admin_token})
+
+    before = client.post("/compare/batch", json={"property_ids": ["4", "2"]}).json()
+    assert before["properties"][0]["predicted_price"] == 250000
+
+    resp = client.post("/properties/changes", json={"changes": [{"op": "upsert", "id": "4", "fields": {"price": 275000}}]})
+    assert resp.status_code == 200
+    assert resp.json() == {"accepted": 1, "applied": True, "revision": 1, "total": 10}
+
+    assert client.get("/properties/4").json()["price"] == 275000
+    after = client.post("/compare/batch", json={"property_ids": ["4", "2"]}).json()
+    assert after["properties"][0]["predicted_price"] == 275000
+    assert after["properties"][1]["predicted_price"] == before["properties"][1]["predicted_price"]
+
+    unauthorised = TestClient(create_app()).post("/properties/changes", json={"changes": [{"op": "delete", "id": "4"}]})
+    assert unauthorised.status_code == 403
+
+    bad = client.post("/properties/changes", json={"changes": [{"op": "upsert", "id": "x", "fields": {"price": 1}}]})
+    assert bad.status_code == 400
+    assert len(changes_path(data_dir).read_text().splitlines()) == 1
+    assert json.loads(changes_path(data_dir).read_text())["changes"] == [
+        {"op": "upsert", "id": "4", "fields": {"price": 275000}}
+    ]
+
+
+def test_ingest_api_is_closed_without_admin_token(data_dir, monkeypatch):
+    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+    monkeypatch.setattr(properties, "data_loader", PropertyDataLoader(str(data_dir)))
+    get_settings.cache_clear()
+    try:
+        resp = TestClient(create_app()).post("/properties/changes", json={"changes": [{"op": "delete", "id": "4"}]})
+    finally:
+        get_settings.cache_clear()
+    assert resp.status_code == 503
+    assert not changes_path(data_dir).exists()
+
+
+def test_ingest_api_stores_coerced_values_and_rejects_bad_fields(data_dir, admin_token, monkeypatch):
+    monkeypatch.setattr(properties, "data_loader", PropertyDataLoader(str(data_dir)))
+    client = TestClient(create_app(), headers={"X-Admin-Token": admin_token})
+
+    resp = client.post(
+        "/properties/changes",
+        json={"changes": [{"op": "upsert", "id": "4", "fields": {"price": "265000", "bedrooms": "3"}}]},
+    )
+    assert resp.status_code == 200
+    logged = json.loads(changes_path(data_dir).read_text())["changes"][0]["fields"]
+    assert logged == {"price": 265000.0, "bedrooms": 3}
+
+    search = client.get("/properties/search", params={"min_bedrooms": 3, "sort_by": "bedrooms", "page_size": 20})
+    assert search.status_code == 200
+    assert "4" in [item["id"] for item in search.json()["results"]]
+    assert PropertyDataLoader(str(data_dir)).by_id()["4"]["bedrooms"] == 3  # replay after a restart
+
+    for fields in ({"bedrooms": None}, {"price": None}, {"distance_km": 1.0}, {"price": "cheap"}, {"bedrooms": -1}):
+        bad = client.post("/properties/changes", json={"changes": [{"op": "upsert", "id": "4", "fields": fields}]})
+        assert bad.status_code == 422, fields
+    assert len(changes_path(data_dir).read_text().splitlines()) == 1
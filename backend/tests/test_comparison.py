@@ -0,0 +1,41 @@
+from backend.routes.compare import resolve_addresses
+from backend.services.comparison import compare_shortlist
+from backend.services.data_loader import PropertyDataLoader
+
+
+def test_compare_shortlist_deltas_and_ranks():
+    properties = [
+        {"id": "a", "price": 100.0, "size": 10},
+        {"id": "b", "price": 200.0, "size": 10},
+        {"id": "c", "price": 300.0, "size": 30},
+    ]
+    features = [{"bedrooms": 1}, {"bedrooms": 2}, {"bedrooms": 4}]
+    stats = compare_shortlist(properties, features, [150.0, 180.0, 300.0])
+
+    assert stats["price_delta"] == [50.0, -20.0, 0.0]
+    assert [d["bedrooms"] for d in stats["feature_deltas"]] == [-1.0, 0.0, 2.0]
+    assert stats["medians"]["predicted_price"] == 180.0
+    assert [r["value"] for r in stats["ranks"]] == [1, 3, 2]
+    assert [r["price_per_sqft"] for r in stats["ranks"]] == [1, 2, 1]
+
+
+def test_resolve_addresses_uses_cached_address_index():
+    loader = PropertyDataLoader("backend/data")
+    properties = loader.load()
+    index = loader.address_index()
+    assert loader.address_index() is index
+
+    used = {"1"}
+    matched, unresolved = resolve_addresses(
+        ["12 Main St, New York, NY", "new york", "the minimalist smart home listing", "Atlantis"],
+        properties,
+        used,
+        index,
+    )
+    assert [p["id"] for p in matched] == ["6", "10"]
+    assert unresolved == ["new york", "Atlantis"]
+    assert used == {"1", "6", "10"}
+
+    loader.apply_changes([{"op": "delete", "id": "2"}])
+    assert loader.address_index() is index
+    assert "miami, fl" not in loader.address_index().by_location
@@ -0,0 +1,37 @@
+import pytest
+
+from backend.services.facets import compute_facets, parse_facets, select_facets
+
+
+def _catalog():
+    return [
+        {"id": "1", "location": "Austin, TX", "price": 240000, "bedrooms": 1, "amenities": ["Gym", "Pool"]},
+        {"id": "2", "location": "Austin, TX", "price": 510000, "bedrooms": 3, "amenities": ["Gym"]},
+        {"id": "3", "location": "Dallas, TX", "price": 2500000, "bedrooms": 7, "amenities": []},
+        {"id": "4", "location": "Dallas, TX", "price": None, "bedrooms": None},
+    ]
+
+
+def test_parse_facets():
+    assert parse_facets(None) == []
+    assert parse_facets(["city,price", "city"]) == ["city", "price"]
+    assert parse_facets(["all"]) == ["city", "bedrooms", "price", "amenities"]
+    with pytest.raises(ValueError):
+        parse_facets(["colour"])
+
+
+def test_compute_facets_counts_in_one_pass():
+    facets = compute_facets(_catalog())
+    assert facets["city"] == {"Austin": 2, "Dallas": 2}
+    assert facets["bedrooms"] == {"0": 0, "1": 1, "2": 0, "3": 1, "4": 0, "5+": 1}
+    assert [bucket["count"] for bucket in facets["price"]] == [1, 0, 1, 0, 0, 1]
+    assert facets["price"][-1] == {"min": 2000000, "max": None, "count": 1}
+    assert facets["amenities"] == {"Gym": 2, "Pool": 1}
+    assert facets["price_stats"] == {"count": 3, "min": 240000, "median": 510000, "max": 2500000}
+
+
+def test_select_facets_keeps_price_stats():
+    facets = compute_facets(_catalog(), ["city"])
+    assert set(facets) == {"city", "price_stats"}
+    assert set(select_facets(compute_facets(_catalog()), ["bedrooms"])) == {"bedrooms", "price_stats"}
+    assert compute_facets([], ["price"])["price_stats"]["median"] is None
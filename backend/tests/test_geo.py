@@ -0,0 +1,59 @@
+from backend.services.filter import apply_filters
+from backend.services.geo import GridIndex, geo_search, geocode, haversine_km, resolve_point
+
+
+def _catalog():
+    return [
+        {"id": "1", "location": "Austin, TX", "price": 400000, "lat": 30.2672, "lon": -97.7431},
+        {"id": "2", "location": "Austin, TX", "price": 500000, "lat": 30.40, "lon": -97.75},
+        {"id": "3", "location": "Dallas, TX", "price": 600000, "lat": 32.7767, "lon": -96.7970},
+        {"id": "4", "location": "Nowhere", "price": 100000, "lat": None, "lon": None},
+    ]
+
+
+def test_geocode_and_resolve_point():
+    assert geocode("Austin, TX") == (30.2672, -97.7431)
+    assert resolve_point("downtown Austin") == (30.2672, -97.7431)
+    assert resolve_point("30.5, -97.7") == (30.5, -97.7)
+    assert resolve_point("Atlantis") is None
+
+
+def test_radius_search_returns_nearby_sorted_by_distance():
+    catalog = _catalog()
+    index = GridIndex.build(catalog)
+    results = geo_search(catalog, index, center=(30.2672, -97.7431), radius_km=25)
+    assert [r["id"] for r in results] == ["1", "2"]
+    ordered = apply_filters(results, sort_by="distance", sort_order="desc")
+    assert [r["id"] for r in ordered] == ["2", "1"]
+    assert ordered[0]["distance_km"] == round(haversine_km((30.2672, -97.7431), (30.40, -97.75)), 3)
+
+
+def test_bounding_box_search():
+    catalog = _catalog()
+    index = GridIndex.build(catalog)
+    results = geo_search(catalog, index, bbox=(32.0, -98.0, 33.0, -96.0))
+    assert [r["id"] for r in results] == ["3"]
+    assert "distance_km" not in results[0]
+
+
+def test_near_without_radius_keeps_listings_without_coordinates():
+    catalog = _catalog()
+    index = GridIndex.build(catalog)
+    results = geo_search(catalog, index, center=(30.2672, -97.7431))
+    assert [r["id"] for r in results] == ["1", "2", "3", "4"]
+    assert results[-1]["distance_km"] is None
+    ordered = apply_filters(results, sort_by="distance", sort_order="desc")
+    assert [r["id"] for r in ordered] == ["3", "2", "1", "4"]
+
+
+def test_grid_index_add_and_remove_by_position():
+    index = GridIndex()
+    for position in range(1000):
+        index.add(30.26, -97.74, position)
+    assert index.remove(30.26, -97.74, 500)
+    assert not index.remove(30.26, -97.74, 500)
+    assert not index.remove(40.0, -74.0, 1)
+    assert len(index) == 999
+    assert 500 not in index.within_bbox((30.0, -98.0, 31.0, -97.0))
+    index.add(30.26, -97.74, 1)  # re-adding a position does not double count
+    assert len(index) == 999
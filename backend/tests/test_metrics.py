@@ -0,0 +1,20 @@
+from backend.services.metrics import MetricsRegistry
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    for value in (0.5, 3, 3, 20000):
+        registry.observe("latency_ms", value, route="/x")
+    body = registry.render()
+    assert 'latency_ms_bucket{route="/x",le="1"} 1' in body
+    assert 'latency_ms_bucket{route="/x",le="5"} 3' in body
+    assert 'latency_ms_bucket{route="/x",le="10000"} 3' in body
+    assert 'latency_ms_bucket{route="/x",le="+Inf"} 4' in body
+    assert 'latency_ms_count{route="/x"} 4' in body
+
+
+def test_cache_hit_ratio_is_derived_from_counters():
+    registry = MetricsRegistry()
+    registry.inc("cache_requests_total", amount=3, cache="catalog", result="hit")
+    registry.inc("cache_requests_total", cache="catalog", result="miss")
+    assert 'cache_hit_ratio{cache="catalog"} 0.75' in registry.render()
@@ -0,0 +1,74 @@
+import marshal
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app import create_app
+from backend.config import get_settings
+from backend.services.profiler import RequestProfiler
+
+
+@pytest.fixture()
+def profiled_client(monkeypatch):
+    monkeypatch.setenv("PROFILING_ENABLED", "true")
+    monkeypatch.setenv("PROFILING_SAMPLE_RATE", "1.0")
+    monkeypatch.setenv("PROFILING_THRESHOLD_MS", "0")
+    monkeypatch.setenv("PROFILING_MAX_PROFILES", "2")
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    get_settings.cache_clear()
+    try:
+        with TestClient(create_app()) as c:
+            yield c
+    finally:
+        get_settings.cache_clear()
+
+
+def test_slow_requests_are_captured_in_bounded_ring(profiled_client: TestClient):
+    for _ in range(3):
+        profiled_client.get("/properties/search", params={"location": "Austin"})
+    profiled_client.get("/health")  # not a profiled path
+
+    headers = {"X-Admin-Token": "secret"}
+    assert profiled_client.get("/admin/profiles").status_code == 403
+    listing = profiled_client.get("/admin/profiles", headers=headers).json()
+    assert [p["id"] for p in listing["profiles"]] == [3, 2]
+    assert all(p["path"] == "/properties/search" for p in listing["profiles"])
+
+    text = profiled_client.get("/admin/profiles/3", headers=headers)
+    assert "function calls" in text.text
+    raw = profiled_client.get("/admin/profiles/3", params={"format": "pstats"}, headers=headers)
+    assert isinstance(marshal.loads(raw.content), dict)
+    assert profiled_client.get("/admin/profiles/3", params={"format": "collapsed"}, headers=headers).status_code == 400
+    assert profiled_client.get("/admin/profiles/1", headers=headers).status_code == 404
+
+
+def test_stack_mode_produces_collapsed_stacks():
+    profiler = RequestProfiler(
+        enabled=True, mode="stack", sample_rate=1.0, threshold_ms=0, paths=["/x"], stack_interval_ms=1
+    )
+    capture = profiler.start("/x")
+    total = 0
+    for i in range(300_000):
+        total += i * i
+    captured = profiler.finish(capture, "GET", "/x")
+    assert captured is not None
+    assert captured.to_collapsed().strip()
+    assert profiler.start("/other") is None
+
+
+def test_admin_routes_fail_closed_without_token(monkeypatch):
+    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+    get_settings.cache_clear()
+    try:
+        client = TestClient(create_app())
+        assert client.get("/admin/profiles").status_code == 503
+        assert client.delete("/admin/profiles", headers={"X-Admin-Token": ""}).status_code == 503
+    finally:
+        get_settings.cache_clear()
+
+
+def test_mode_is_case_insensitive_and_only_checked_when_enabled():
+    assert RequestProfiler(enabled=True, mode="Stack").mode == "stack"
+    assert RequestProfiler(enabled=False, mode="bogus").start("/x") is None
+    with pytest.raises(ValueError):
+        RequestProfiler(enabled=True, mode="bogus")
@@ -0,0 +1,50 @@
+import csv
+import json
+import shutil
+
+from backend.services.changes import append_changes
+from backend.services.data_loader import PropertyDataLoader
+from backend.services.revaluation import revalue
+
+
+def test_revalue_writes_jsonl_in_process(tmp_path):
+    output = tmp_path / "out.jsonl"
+    summary = revalue(output, data_dir="backend/data", workers=0, chunk_size=3, progress=None)
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert summary["rows"] == len(rows) == 10
+    assert summary["chunks"] == 4
+    assert rows[0]["id"] == "1"
+    assert {"predicted_price", "delta", "delta_pct"} <= rows[0].keys()
+
+
+def test_revalue_writes_csv_with_process_pool(tmp_path):
+    output = tmp_path / "out.csv"
+    summary = revalue(output, data_dir="backend/data", workers=2, chunk_size=4, progress=None)
+    with output.open() as f:
+        rows = list(csv.DictReader(f))
+    assert summary["format"] == "csv"
+    assert [row["id"] for row in rows] == [str(i) for i in range(1, 11)]
+
+
+def test_revalue_applies_the_change_log(tmp_path):
+    for name in ("property_basics.json", "property_characteristics.json", "property_images.json"):
+        shutil.copy(f"backend/data/{name}", tmp_path / name)
+    append_changes(tmp_path, [
+        {"op": "upsert", "id": "4", "fields": {"price": 265000}},
+        {"op": "delete", "id": "1"},
+        {"op": "upsert", "id": "new-1", "fields": {"title": "Loft", "price": 500000, "location": "Austin, TX"}},
+    ])
+    append_changes(tmp_path, [
+        {"op": "upsert", "id": "3", "fields": {"location": "Austin, TX"}},
+        {"op": "delete", "id": "2"},
+        {"op": "upsert", "id": "2", "fields": {"title": "Rebuilt", "price": 300000, "location": "Miami, FL"}},
+    ])
+    streamed = [row for chunk in PropertyDataLoader(str(tmp_path)).iter_chunks(chunk_size=4) for row in chunk]
+    assert sorted(streamed, key=lambda p: p["id"]) == sorted(PropertyDataLoader(str(tmp_path)).load(), key=lambda p: p["id"])
+    assert streamed[-1]["id"] == "new-1"
+
+    output = tmp_path / "out.jsonl"
+    summary = revalue(output, data_dir=str(tmp_path), workers=0, chunk_size=4, progress=None)
+    rows = {json.loads(line)["id"]: json.loads(line) for line in output.read_text().splitlines()}
+    assert summary["rows"] == len(rows) == 10
+    assert "1" not in rows and rows["4"]["price"] == 265000 and rows["2"]["price"] == 300000
@@ -0,0 +1,120 @@
+import multiprocessing
+
+from backend.services.data_loader import PropertyDataLoader
+from backend.services.facets import compute_facets
+from backend.services.filter import apply_filters
+from backend.services.geo import GridIndex, geo_search
+from backend.services.shared_catalog import SharedCatalog, publish_snapshot, read_generation, snapshot_path
+
+
+def _publish(tmp_path):
+    properties = PropertyDataLoader("backend/data").load()
+    generation = publish_snapshot(properties, tmp_path)
+    return properties, SharedCatalog(snapshot_path(tmp_path, generation))
+
+
+def test_snapshot_round_trips_rows_and_indexes(tmp_path):
+    properties, catalog = _publish(tmp_path)
+    assert len(catalog) == len(properties)
+    assert list(catalog) == properties
+    assert catalog.by_id()["7"] == next(p for p in properties if p["id"] == "7")
+    assert "missing" not in catalog.by_id()
+    assert catalog.facets == compute_facets(properties)
+    assert list(catalog.column("price")) == [float(p["price"]) for p in properties]
+
+    local = geo_search(properties, GridIndex.build(properties), center=(30.2672, -97.7431), radius_km=50)
+    shared = geo_search(catalog, catalog.geo_index(), center=(30.2672, -97.7431), radius_km=50)
+    assert shared == local
+
+
+def test_column_search_matches_apply_filters(tmp_path):
+    properties, catalog = _publish(tmp_path)
+    cases = [
+        {},
+        {"sort_by": "price", "sort_order": "desc"},
+        {"sort_by": "bedrooms", "sort_order": "desc"},
+        {"location": ["New York", "Austin"], "min_price": 260000, "min_bedrooms": 1},
+        {"max_price": 800000, "min_bathrooms": 2, "sort_by": "bedrooms"},
+        {"location": "Atlantis"},
+        {"sort_by": "bedrooms", "sort_order": "descending"},
+        {"sort_by": "title"},
+    ]
+    for filters in cases:
+        rows = catalog.search(**filters)
+        assert list(rows) == apply_filters(properties, **filters), filters
+    page = catalog.search(sort_by="price")[2:4]
+    assert page == apply_filters(properties)[2:4]
+
+
+def test_shared_loader_search_decodes_only_what_is_read(tmp_path, monkeypatch):
+    properties, _ = _publish(tmp_path)
+    loader = PropertyDataLoader(snapshot_dir=str(tmp_path))
+    catalog = loader.load()
+    decoded = []
+    original = catalog._row
+    monkeypatch.setattr(catalog, "_row", lambda i: decoded.append(i) or original(i))
+
+    results = loader.search(min_price=300000, sort_order="desc")
+    assert len(results) == len(apply_filters(properties, min_price=300000))
+    assert decoded == []
+    assert results[:2] == apply_filters(properties, min_price=300000, sort_order="desc")[:2]
+    assert len(decoded) == 2
+
+    decoded.clear()
+    with_amenities = loader.search(amenities=["GYM", "security"], sort_by="bedrooms")
+    assert decoded == []
+    assert list(with_amenities) == apply_filters(properties, amenities=["GYM", "security"], sort_by="bedrooms")
+    assert len(loader.search(amenities=["gym", "moat"])) == 0
+
+
+def test_column_facets_match_compute_facets_without_decoding(tmp_path, monkeypatch):
+    properties, catalog = _publish(tmp_path)
+    monkeypatch.setattr(catalog, "_row", lambda i: (_ for _ in ()).throw(AssertionError("row decoded")))
+    for filters in ({}, {"min_price": 300000}, {"location": "Austin", "amenities": ["gym"]}, {"location": "Atlantis"}):
+        rows = catalog.search(**filters)
+        expected = compute_facets(apply_filters(properties, **filters))
+        assert rows.facets() == expected, filters
+        assert rows.facets(["city"]) == compute_facets(apply_filters(properties, **filters), ["city"])
+
+
+def test_loader_follows_generation_swaps(tmp_path):
+    properties, _ = _publish(tmp_path)
+    loader = PropertyDataLoader(snapshot_dir=str(tmp_path))
+    first = loader.load()
+    version = loader.version
+
+    publish_snapshot(properties[:3], tmp_path)
+    assert read_generation(tmp_path) == 2
+    assert loader.load() is first  # within the re-check interval
+    swapped = loader.load(force_reload=True)
+    assert len(swapped) == 3 and swapped.generation == 2
+    assert loader.version == version + 1
+
+
+def _child_reads(path, queue):
+    catalog = SharedCatalog(path)
+    queue.put((len(catalog), catalog.by_id()["3"]["location"]))
+
+
+def test_workers_attach_from_other_processes(tmp_path):
+    _, catalog = _publish(tmp_path)
+    queue = multiprocessing.get_context("spawn").Queue()
+    child = multiprocessing.get_context("spawn").Process(target=_child_reads, args=(catalog.path, queue))
+    child.start()
+    child.join(timeout=30)
+    assert queue.get(timeout=5) == (10, "Los Angeles, CA")
+
+
+def test_search_route_in_shared_mode_matches_local(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from backend.app import create_app
+    from backend.routes import properties as properties_route
+
+    _publish(tmp_path)
+    client = TestClient(create_app())
+    params = {"min_bedrooms": 2, "amenities": "gym", "sort_order": "desc", "page_size": 2, "facets": "all"}
+    local = client.get("/properties/search", params=params).json()
+    monkeypatch.setattr(properties_route, "data_loader", PropertyDataLoader(snapshot_dir=str(tmp_path)))
+    assert client.get("/properties/search", params=params).json() == local
+    assert client.get("/properties/search", params={"page": 2}).json()["total"] == 10
@@ -0,0 +1,20 @@
+from backend.benchmarks.startup import check_budget, measure_startup, parse_importtime
+
+
+def test_parse_importtime_groups_by_top_level_package():
+    output = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:      1500 |       1500 |     fastapi.params",
+            "import time:       500 |       2000 |   fastapi",
+            "import time:       250 |        250 | json",
+        ]
+    )
+    assert parse_importtime(output) == {"fastapi": 2.0, "json": 0.25}
+
+
+def test_startup_does_not_load_heavy_optional_dependencies():
+    report = measure_startup(runs=1)
+    assert report["first_request_status"] == 200
+    assert report["heavy_modules_loaded"] == []
+    assert check_budget(report, import_budget_ms=1e9, startup_budget_ms=1e9) == []
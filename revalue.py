@@ -0,0 +1,7 @@
+import sys
+
+from backend.services.revaluation import main
+
+# Run with: python revalue.py predictions.jsonl --workers 4
+if __name__ == "__main__":
+    sys.exit(main())
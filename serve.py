@@ -0,0 +1,42 @@
+"""Run the API with several workers sharing one catalog snapshot.
+
+The catalog is merged once here, published to CATALOG_SNAPSHOT_DIR, and every
+uvicorn worker maps that snapshot read-only instead of loading its own copy.
+Publish a new generation (``python -m backend.services.shared_catalog publish``)
+to swap the catalog under running workers.
+"""
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+import uvicorn
+
+from backend.config import get_settings
+from backend.services.data_loader import PropertyDataLoader
+from backend.services.shared_catalog import publish_snapshot
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--snapshot-dir", default=settings.catalog_snapshot_dir)
+    args = parser.parse_args()
+
+    properties = PropertyDataLoader(settings.data_dir).load()
+    generation = publish_snapshot(properties, Path(args.snapshot_dir))
+    print(json.dumps({"published_generation": generation, "rows": len(properties)}))
+
+    # Workers inherit the environment, so they come up in shared mode
+    os.environ["CATALOG_MODE"] = "shared"
+    os.environ["CATALOG_SNAPSHOT_DIR"] = str(Path(args.snapshot_dir).resolve())
+    uvicorn.run("main:app", host=args.host, port=args.port, workers=args.workers)
+
+
+# Run with: python serve.py --workers 4
+if __name__ == "__main__":
+    main()